@@ -0,0 +1,63 @@
+""" Structured form of an availability question, parsed without the LLM """
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+SEARCH_TERMS = ["tournament", "beginner", "workshop", "social", "casual", "competition"]
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+WEEKDAY_PATTERN = re.compile(r"\b(next\s+)?(" + "|".join(WEEKDAYS) + r")\b")
+
+@dataclass
+class EventQuery:
+    """A date range and a keyword for search_happenings"""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    keyword: Optional[str] = None
+
+def parse_event_query(query: str, now: Optional[datetime] = None) -> EventQuery:
+    """Deterministic extraction of the filters search_happenings applies.
+
+    Understood: today (tonight), tomorrow, (next) weekend, this/next week and weekday
+    names ("Saturday" is the nearest one, today included; "next Saturday" the
+    first one after today). Weeks start on Monday. Anything else lists the
+    upcoming events.
+    """
+    query_lower = query.lower()
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    monday = today - timedelta(days=today.weekday())
+    event_query = EventQuery()
+    weekday = WEEKDAY_PATTERN.search(query_lower)
+
+    if "today" in query_lower or "tonight" in query_lower:
+        event_query.start, event_query.end = today, today + timedelta(days=1)
+    elif "tomorrow" in query_lower:
+        event_query.start = today + timedelta(days=1)
+        event_query.end = event_query.start + timedelta(days=1)
+    elif "weekend" in query_lower:
+        # Saturday and Sunday of this week; on a Sunday only what is left of it
+        saturday = monday + timedelta(days=5)
+        if "next weekend" in query_lower:
+            saturday += timedelta(days=7)
+        event_query.start = max(saturday, today)
+        event_query.end = saturday + timedelta(days=2)
+    elif "next week" in query_lower:
+        event_query.start = monday + timedelta(days=7)
+        event_query.end = event_query.start + timedelta(days=7)
+    elif "this week" in query_lower:
+        event_query.start, event_query.end = today, monday + timedelta(days=7)
+    elif weekday:
+        ahead = (WEEKDAYS.index(weekday.group(2)) - today.weekday()) % 7
+        if weekday.group(1) and ahead == 0:
+            ahead = 7
+        event_query.start = today + timedelta(days=ahead)
+        event_query.end = event_query.start + timedelta(days=1)
+    else:
+        # Default to upcoming events ("What events do you have?" must not list past ones)
+        event_query.start = now
+
+    # Content-based search (title, description), first matching term only
+    event_query.keyword = next((term for term in SEARCH_TERMS if term in query_lower), None)
+    return event_query
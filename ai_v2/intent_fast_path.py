@@ -0,0 +1,116 @@
+""" Embedding based intent classification, tried before the LLM classifier """
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+from collection_db import get_embedder
+from utils.sentence_splitter import SENTENCE_BOUNDARY
+from utils.executors import embedding_pool
+from ai_v2.states import IntentItem
+from schema.sound import INTENT_FAST_PATH_MIN_SCORE, INTENT_FAST_PATH_MIN_MARGIN, INTENT_FAST_PATH_MAX_WORDS
+
+# Labeled examples of the intents of node_classify_intent, one centroid each
+EXAMPLES: Dict[str, List[str]] = {
+    "availability": [
+        "Is there an upcoming event?",
+        "What events do you have?",
+        "When is the next tournament?",
+        "Are there any games this weekend?",
+        "What's happening tomorrow?",
+        "Is there anything today?",
+        "What time does the event start?",
+        "Where is the event held?",
+        "Do you have any beginner workshops coming up?",
+        "What's the schedule for next week?",
+        "Any Tongits games soon?",
+        "When is the next session?",
+    ],
+    "registration": [
+        "I'd like to join.",
+        "Register me please.",
+        "Sign me up for the tournament.",
+        "Count me in.",
+        "Yes, please register me.",
+        "Yes.",
+        "Yes, I confirm.",
+        "That's correct.",
+        "My name is Maria Santos.",
+        "You can call me Osmar.",
+        "My email is john@example.com.",
+        "My nickname is Pau.",
+        "I want to join the finals.",
+        "Can I sign up?",
+    ],
+    "neutral": [
+        "Hi.",
+        "Hello!",
+        "Good morning.",
+        "Hey there, how are you?",
+        "Thanks.",
+        "Thank you so much.",
+        "Okay.",
+        "Goodbye.",
+        "See you later.",
+        "Nice to meet you.",
+        "What's your name?",
+        "How's the weather today?",
+        "Tell me a joke.",
+    ],
+}
+
+class CentroidIntentClassifier:
+    """Nearest-centroid classifier over the sentence embeddings of the shared embedder.
+
+    Every sentence of the message is compared (cosine) with the mean embedding
+    of each intent's examples. A result is only returned when every sentence is
+    close to the same centroid and clearly closer to it than to the others;
+    ambiguous, multi-intent or long messages are left to the LLM.
+    Thresholds are checked with python -m benchmarks.intent.
+    """
+
+    def __init__(self, examples: Dict[str, List[str]] = EXAMPLES, min_score: float = INTENT_FAST_PATH_MIN_SCORE,
+                 min_margin: float = INTENT_FAST_PATH_MIN_MARGIN, max_words: int = INTENT_FAST_PATH_MAX_WORDS):
+        self.examples = examples
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.max_words = max_words
+        self._labels = list(examples)
+        self._centroids: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _encode(texts: List[str]) -> np.ndarray:
+        return np.asarray(get_embedder().encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """Unit-length centroid per intent, computed on first use"""
+        if self._centroids is None:
+            with self._lock:
+                if self._centroids is None:
+                    centroids = np.stack([self._encode(self.examples[label]).mean(axis=0) for label in self._labels])
+                    self._centroids = centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+        return self._centroids
+
+    def predict(self, text: str) -> Optional[List[IntentItem]]:
+        """Blocking; None when the LLM has to classify the message"""
+        sentences = [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+        if not sentences or len(text.split()) > self.max_words:
+            return None
+
+        scores = self._encode(sentences) @ self.centroids.T
+        intents = set()
+        for row in scores:
+            best, second = np.argsort(row)[::-1][:2]
+            if row[best] < self.min_score or row[best] - row[second] < self.min_margin:
+                return None
+            intents.add(self._labels[best])
+        # Splitting a message between intents is left to the LLM
+        if len(intents) != 1:
+            return None
+        return [IntentItem(intent=intents.pop(), phrase_message=text.strip())]
+
+    async def classify(self, text: str) -> Optional[List[IntentItem]]:
+        return await embedding_pool.run(self.predict, text)
+
+
+intent_classifier = CentroidIntentClassifier()
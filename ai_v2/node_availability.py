@@ -1,4 +1,5 @@
 import json
+import asyncio
 from ai_v2.states import AgentState
 from langchain_core.prompts import ChatPromptTemplate
 from langchain.agents import AgentExecutor, create_react_agent
@@ -13,17 +14,11 @@ from database import get_db
 from langchain_community.callbacks.manager import get_openai_callback
 from langchain_core.messages import AIMessage
 from langchain_core.runnables import RunnableConfig, RunnableLambda
+from ai_v2.runnables import runnables, AVAILABILITY
+from schema.sound import AVAILABILITY_MODE
+from ai_v2.event_query import parse_event_query
 
-def node_availability(state: AgentState, config: RunnableConfig) -> AgentState:
-    """Handle event availability and scheduling inquiries."""
-    
-    # Check if this node should handle the request
-    intents = state.get("intent", [])
-    if "availability" not in intents:
-        # This node doesn't handle this intent, return empty raw_messages
-        return state
-    
-    AVAILABILITY_PROMPT = """You are a JSON data retrieval assistant that uses tools to find upcoming events. Follow the ReAct format exactly.
+AVAILABILITY_PROMPT = """You are a JSON data retrieval assistant that uses tools to find upcoming events. Follow the ReAct format exactly.
 
 Use the following format:
 
@@ -52,46 +47,64 @@ Begin!
 
 Thought: I need to retrieve event data for this query"""
 
+def build_availability_agent():
+    tools = [event_search_tool]
+    # Create Marcus agent
+    availability_prompt = ChatPromptTemplate.from_messages([
+        ("system", AVAILABILITY_PROMPT),
+        ("system","{agent_scratchpad}"),
+        ("system","{tools}")
+    ]).partial(tool_descriptions="\n".join([f"- {t.name}: {t.description}" for t in tools]))
+    agent = create_react_agent(
+        llm=base_llm,
+        tools=tools,
+        prompt=availability_prompt,
+        tools_renderer=lambda tools: ", ".join([t.name for t in tools])
+    )
+    return AgentExecutor.from_agent_and_tools(
+        agent=agent,
+        tools=tools,
+        verbose=True,
+        max_iterations=3,
+        handle_parsing_errors=True,
+        early_stopping_method="force",
+        return_intermediate_steps=True  # Key parameter
+    )
+
+runnables.register(AVAILABILITY, build_availability_agent)
+
+async def node_availability(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Handle event availability and scheduling inquiries."""
+    
+    # Check if this node should handle the request
+    intents = state.get("intent", [])
+    if "availability" not in intents:
+        # This node doesn't handle this intent, return empty raw_messages
+        return state
+
     try:
         intent_phrases = ",".join(
             [item.phrase_message for item in state["intent_list"] if item.intent == "availability"]
         )
-        # Create availability tools
-        # tools = [event_search_tool]
-        tools = [event_search_tool]
-        tool_descriptions = "\n".join(
-            [f"- {t.name}: {t.description}" for t in tools]
-        )
+        if AVAILABILITY_MODE == "direct":
+            # Single shot: the phrases are parsed into an EventQuery and the events JSON
+            # goes straight to the consolidator, no LLM call
+            start_time = datetime.now()
+            events_json = await asyncio.to_thread(lookup_events, intent_phrases)
+            elapsed = (datetime.now() - start_time).total_seconds()
+            print(f"Time spent node_availability (direct): {elapsed:.3f}")
+            return {
+                **state,
+                "raw_messages": state["raw_messages"].append(events_json)
+            }
 
-        # Create Marcus agent
-        availability_prompt = ChatPromptTemplate.from_messages([
-            ("system", AVAILABILITY_PROMPT),
-            ("system","{agent_scratchpad}"),
-            ("system","{tools}")
-        ])
-        agent = create_react_agent(
-            llm=base_llm,
-            tools=tools,
-            prompt=availability_prompt
-        )
-        agent_executor = AgentExecutor.from_agent_and_tools(
-            agent=agent,
-            tools=tools,
-            verbose=True,
-            max_iterations=3,
-            handle_parsing_errors=True,
-            early_stopping_method="force",
-            return_intermediate_steps=True  # Key parameter
-        )
+        agent_executor = runnables.get(AVAILABILITY)
         with get_openai_callback() as cb:
             # Execute availability agent
             start_time = datetime.now()
-            result = agent_executor.invoke({
-                "intent_phrases": intent_phrases,
-                "tool_descriptions": tool_descriptions,
-                "tools": ", ".join([t.name for t in tools]),
-                "tool_names": ", ".join([t.name for t in tools])
-            })      
+            result = await agent_executor.ainvoke({
+                "intent_phrases": intent_phrases
+            }, config=config)      
 
             print("**********************************")
             print("--- node_availability ---")
@@ -129,101 +142,39 @@ String containing event information based on the query.
 """
     
     try:
-        # Use your existing generator properly
-        db_gen = get_db()
-        db = next(db_gen)
-        
-        try:
-            events = search_happenings(db, query)
-
-            if events:
-                events_data = [e.to_dict() for e in events]
-                return json.dumps(events_data, indent=2, default=str)
-            else:
-                return json.dumps([], indent=2)
-        finally:
-            db.close()
-            
+        return lookup_events(query)
     except Exception as e:
         print(f"Error in event_search_tool: {e}")
         return []
-    
+
+def lookup_events(query: str) -> str:
+    """Run search_happenings once and return the events as JSON"""
+    # Use your existing generator properly
+    db_gen = get_db()
+    db = next(db_gen)
+    try:
+        events = search_happenings(db, query)
+        return json.dumps([e.to_dict() for e in events], indent=2, default=str)
+    finally:
+        db.close()
+
 def search_happenings(db: Session, query: str) -> list:
     """Search the happenings table based on query keywords."""
-    
-    query_lower = query.lower()
+    event_query = parse_event_query(query)
     base_query = db.query(Happenings)
-    
-    # Time-based filters
-    now = datetime.now()
-    FUTURE_KEYWORDS = [
-        "upcoming", "next", "future", "later", "soon", "coming", "ahead", "approaching", "in advance",
-        "what’s next", "whats next", "coming up", "what’s coming", "whats coming", 
-        "later on", "after this", "future events", "next schedule", 
-        "next session", "next round", "next match", "what’s ahead", "whats ahead"
-    ]
-
-    # handle upcoming event logic
 
-    if "today" in query_lower:
-        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_of_day + timedelta(days=1)
+    if event_query.start is not None:
+        base_query = base_query.filter(Happenings.date_of_event >= event_query.start)
+    if event_query.end is not None:
+        base_query = base_query.filter(Happenings.date_of_event < event_query.end)
+    if event_query.keyword:
         base_query = base_query.filter(
-            and_(
-                Happenings.date_of_event >= start_of_day,
-                Happenings.date_of_event < end_of_day
+            or_(
+                Happenings.title.ilike(f"%{event_query.keyword}%"),
+                Happenings.description.ilike(f"%{event_query.keyword}%")
             )
         )
-    elif "tomorrow" in query_lower:
-        tomorrow_start = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        tomorrow_end = tomorrow_start + timedelta(days=1)
-        base_query = base_query.filter(
-            and_(
-                Happenings.date_of_event >= tomorrow_start,
-                Happenings.date_of_event < tomorrow_end
-            )
-        )
-    # elif "this week" in query_lower or "upcoming" in query_lower:
-    #     week_end = now + timedelta(days=7)
-    #     base_query = base_query.filter(
-    #         and_(
-    #             Happenings.date_of_event >= now,
-    #             Happenings.date_of_event <= week_end
-    #         )
-    #     )
-    # elif "next week" in query_lower:
-    #     week_start = now + timedelta(days=7)
-    #     week_end = week_start + timedelta(days=7)
-    #     base_query = base_query.filter(
-    #         and_(
-    #             Happenings.date_of_event >= week_start,
-    #             Happenings.date_of_event <= week_end
-    #         )
-    #     )
-    elif any(word in query_lower for word in FUTURE_KEYWORDS):
-        base_query = base_query.filter(Happenings.date_of_event >= now)
-        
-        # Default to future events
-        
-    # Debug: Print the query results before content-based filtering
-    # results = base_query.all()
-    # print(f"[Debug] - Found {len(results)} events after date filter:")
-    # for event in results:
-    #     print(f"Event: {event.title} on {event.date_of_event}")
-    
-    # Content-based search (title, description)
-    search_terms = ["tournament", "beginner", "workshop", "social", "casual", "competition"]
-    
-    for term in search_terms:
-        if term in query_lower:
-            base_query = base_query.filter(
-                or_(
-                    Happenings.title.ilike(f"%{term}%"),
-                    Happenings.description.ilike(f"%{term}%")
-                )
-            )
-            break  # Use first matching term
-    
+
     # Execute query and return results
     return base_query.order_by(Happenings.date_of_event).limit(5).all()
 
@@ -8,19 +8,11 @@ from typing import List
 from langchain_core.output_parsers import PydanticOutputParser
 from langgraph.graph.state import RunnableConfig
 from ai_v2.states import AgentState, IntentItem
+from ai_v2.runnables import runnables, CLASSIFY_INTENT
+from ai_v2.intent_fast_path import intent_classifier
+from schema.sound import INTENT_FAST_PATH
 
-
-
-# --- GRAPH NODES ---
-def node_classify_intent(state: AgentState) -> AgentState:
-    """Classify intent using LLM."""    
-    # intent_parser = PydanticOutputParser(pydantic_object=List(IntentItem))
-
-    # format_instructions = intent_parser.get_format_instructions()
-    # # Escape { and } so they are treated literally
-    # escaped_format_instructions = format_instructions.replace("{", "{{").replace("}", "}}")
-
-    system_prompt = """Your role is to classify the user's input into one or more intents and extract the EXACT phrase from their message that indicates each intent.
+CLASSIFY_INTENT_PROMPT = """Your role is to classify the user's input into one or more intents and extract the EXACT phrase from their message that indicates each intent.
 
 INTENT CATEGORIES (3 intents only):
 
@@ -59,19 +51,48 @@ Output: [
 No explanations. No extra text. Only JSON.
 """
 
+def build_classify_intent_chain():
     intent_prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
+        ("system", CLASSIFY_INTENT_PROMPT),
         ("human", "{user_message}")
-    ])   
+    ])
+    return intent_prompt | base_llm
+
+runnables.register(CLASSIFY_INTENT, build_classify_intent_chain)
+
+# --- GRAPH NODES ---
+async def node_classify_intent(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Classify intent using the embedding fast path, or the LLM when it is not confident."""    
+    # intent_parser = PydanticOutputParser(pydantic_object=List(IntentItem))
+
+    # format_instructions = intent_parser.get_format_instructions()
+    # # Escape { and } so they are treated literally
+    # escaped_format_instructions = format_instructions.replace("{", "{{").replace("}", "}}")
+
+    if INTENT_FAST_PATH:
+        start_time = datetime.now()
+        try:
+            result = await intent_classifier.classify(state.get("input_message", ""))
+        except Exception as e:
+            print("Error in fast intent classification :", e)
+            result = None
+        if result:
+            elapsed = (datetime.now() - start_time).total_seconds()
+            print(f"⚡ Fast path intent in {elapsed:.3f}s: {[r.dict() for r in result]}")
+            return {
+                **state,
+                "intent": [item.intent for item in result],
+                "intent_list": result
+            }
 
-    chain = intent_prompt | base_llm 
+    chain = runnables.get(CLASSIFY_INTENT)
 
     try:
         with get_openai_callback() as cb:
             start_time = datetime.now()
-            response = chain.invoke({
+            response = await chain.ainvoke({
                 "user_message": state.get("input_message", "")
-            })
+            }, config=config)
             
             # Parse JSON content into Python list of dicts
             parsed = json.loads(response.content)
@@ -6,11 +6,9 @@ from langchain_core.prompts import ChatPromptTemplate
 from llm_model import base_llm
 from langchain_community.callbacks.manager import get_openai_callback
 from langgraph.graph.state import RunnableConfig
+from ai_v2.runnables import runnables, CONSOLIDATOR
 
-def node_consolidator_manager(state: AgentState, config: RunnableConfig) -> AgentState:
-    """This node is a consolidator of all raw message coming from the AI and the tools results."""
-    
-    CONSOLIDATOR_PROMPT = """
+CONSOLIDATOR_PROMPT = """
 Your task is to consolidate and respond naturally based on the user's question, relevant factual 
 information from raw_messages, and the conversation summary.
 
@@ -69,7 +67,13 @@ Summary of conversation: {conversation_summary}
 Now provide a natural, helpful response following all rules strictly.
 """
 
+def build_consolidator_chain():
+    return ChatPromptTemplate.from_template(CONSOLIDATOR_PROMPT) | base_llm
+
+runnables.register(CONSOLIDATOR, build_consolidator_chain)
 
+async def node_consolidator_manager(state: AgentState, config: RunnableConfig) -> AgentState:
+    """This node is a consolidator of all raw message coming from the AI and the tools results."""
 
 #     print(f"[DEBUG] - node_consolidator_manager state: ")
 #     print(json.dumps(state, indent=4, ensure_ascii=False, default=str))
@@ -79,16 +83,13 @@ Now provide a natural, helpful response following all rules strictly.
         # print(f"[DEBUG] - node_consolidator_manager raw_messages: {raw_messages}")
         # Create persuasion tools 
         user_message = state.get("input_message", "")
-        # Create Elena agent
-        persuasion_prompt = ChatPromptTemplate.from_template(CONSOLIDATOR_PROMPT)                  
-        
-        chain = persuasion_prompt | base_llm
+        chain = runnables.get(CONSOLIDATOR)
         
         with get_openai_callback() as cb:
 
             start_time = datetime.now()
             try:
-                llm_output = chain.invoke({
+                llm_output = await chain.ainvoke({
                     "raw_messages": raw_messages,
                     "user_message": user_message,
                     "conversation_summary": state.get("short_message",""),
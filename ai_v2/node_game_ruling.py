@@ -7,8 +7,71 @@ from langchain_community.callbacks.manager import get_openai_callback
 from langchain.agents import AgentExecutor, create_react_agent
 from langgraph.graph.state import RunnableConfig
 from langchain_core.tools import tool
-from collection_db import chroma_client, embedder, GAME_COLLECTION_NAME
+from collection_db import chroma_client, get_embedder, GAME_COLLECTION_NAME
 from ai_v2.states import AgentState
+from utils.executors import embedding_pool
+from ai_v2.runnables import runnables, GAME_RULING
+
+GAME_RULES_PROMPT = """Your role is to synthesize a response to answer questions based on the result of the tool here {tool_names}.
+The relevant question is the {user_message}, analyze the result based on the user's message.
+
+TOOLS:
+You have access to the following tool(s): {tool_descriptions}
+(When calling tools, always use the exact tool id: {tool_names})
+
+OUTPUT FORMAT (must always follow this order):
+Thought: One-line summary of what you will do (short and simple)
+Action: {tool_names}
+Action Input: the user's question in search form (just the string, no JSON)
+Observation: [tool results]
+Thought: Summarize the observation in 1–2 sentences.
+Final Answer: Give the helpful answer.
+
+IMPORTANT EXECUTION RULE:
+After you receive an Observation from the tool, you MUST:
+- Write a Thought line summarizing what you saw (1–2 sentences).
+- Then write a Final Answer for the human.
+- Do NOT call any tool again after the first Observation.
+
+CRITICAL RULES:
+1. You MUST call {tool_names} exactly once.
+2. After the Observation, do NOT call another tool again (see rule above).
+3. If the user asks about another game (Poker, Mahjong, etc.), still call {tool_names} once, then explain in Final Answer that you only support Tongits.
+4. If the tool returns truncated or no results, still write Observation, then give your best Thought and Final Answer anyway.
+5. Never stop before giving a Final Answer. Every output must include all six parts: Thought → Action → Action Input → Observation → Thought → Final Answer.
+
+EXAMPLE 1 - Tongits question:
+Human: What is sapaw in Tongits?
+
+Thought: Search the Tongits rules for "sapaw" and summarize.
+Action: {tool_names}
+Action Input: sapaw in Tongits
+Observation: [tool returns results]
+Thought: The tool result shows that sapaw means adding cards to an existing meld.
+Final Answer: In Tongits, "sapaw" means adding cards to an existing meld on the table, either your own or an opponent's.
+
+EXAMPLE 2 - Truncated result:
+Human: What is the lowest deadwood rule?
+
+Thought: Search the Tongits rules for "lowest deadwood" and summarize.
+Action: {tool_names}
+Action Input: lowest deadwood in Tongits
+Observation: Found 3 relevant document rules: [truncated...]
+Thought: The tool mentions winning by having the lowest deadwood when the game ends.
+Final Answer: In Tongits, besides winning by Tongit, a player can also win by having the lowest deadwood when the game ends.
+
+EXAMPLE 3 - Non-Tongits question:
+Human: How to win in Mahjong?
+
+Thought: Search the Tongits rules for "Mahjong win" to confirm coverage.
+Action: {tool_names}
+Action Input: how to win in Mahjong
+Observation: Tool returned only Tongits-related results, no Mahjong rules.
+Thought: The database contains Tongits rules but no information about Mahjong.
+Final Answer: I can't provide rules for Mahjong, since I only assist with Tongits. If you'd like, ask me any Tongits rule instead!
+
+Begin!
+"""
 
 @tool
 def tool_game_rules(query: str, top_k: int = 3) -> str:
@@ -34,7 +97,7 @@ def tool_game_rules(query: str, top_k: int = 3) -> str:
                 return f"No documents found in collection '{conversation_thread_id}'."
 
             try:
-                query_embedding = embedder.encode(query)
+                query_embedding = embedding_pool.call(get_embedder().encode, query)
                 
                 query_embedding = query_embedding.tolist()
                 
@@ -87,92 +150,22 @@ def tool_game_rules(query: str, top_k: int = 3) -> str:
         traceback.print_exc()
         return f"Error searching document rule: {str(e)}"
 
-def node_game_ruling(state: AgentState, config: RunnableConfig) -> AgentState:
-    if "game_rules" not in state.get("intent", []):
-        return state  # Skip if not relevant
-    
-    GAME_RULES_PROMPT = """Your role is to synthesize a response to answer questions based on the result of the tool here {tool_names}.
-The relevant question is the {user_message}, analyze the result based on the user's message.
-
-TOOLS:
-You have access to the following tool(s): {tool_descriptions}
-(When calling tools, always use the exact tool id: {tool_names})
-
-OUTPUT FORMAT (must always follow this order):
-Thought: One-line summary of what you will do (short and simple)
-Action: {tool_names}
-Action Input: the user's question in search form (just the string, no JSON)
-Observation: [tool results]
-Thought: Summarize the observation in 1–2 sentences.
-Final Answer: Give the helpful answer.
-
-IMPORTANT EXECUTION RULE:
-After you receive an Observation from the tool, you MUST:
-- Write a Thought line summarizing what you saw (1–2 sentences).
-- Then write a Final Answer for the human.
-- Do NOT call any tool again after the first Observation.
-
-CRITICAL RULES:
-1. You MUST call {tool_names} exactly once.
-2. After the Observation, do NOT call another tool again (see rule above).
-3. If the user asks about another game (Poker, Mahjong, etc.), still call {tool_names} once, then explain in Final Answer that you only support Tongits.
-4. If the tool returns truncated or no results, still write Observation, then give your best Thought and Final Answer anyway.
-5. Never stop before giving a Final Answer. Every output must include all six parts: Thought → Action → Action Input → Observation → Thought → Final Answer.
-
-EXAMPLE 1 - Tongits question:
-Human: What is sapaw in Tongits?
-
-Thought: Search the Tongits rules for "sapaw" and summarize.
-Action: {tool_names}
-Action Input: sapaw in Tongits
-Observation: [tool returns results]
-Thought: The tool result shows that sapaw means adding cards to an existing meld.
-Final Answer: In Tongits, "sapaw" means adding cards to an existing meld on the table, either your own or an opponent's.
-
-EXAMPLE 2 - Truncated result:
-Human: What is the lowest deadwood rule?
-
-Thought: Search the Tongits rules for "lowest deadwood" and summarize.
-Action: {tool_names}
-Action Input: lowest deadwood in Tongits
-Observation: Found 3 relevant document rules: [truncated...]
-Thought: The tool mentions winning by having the lowest deadwood when the game ends.
-Final Answer: In Tongits, besides winning by Tongit, a player can also win by having the lowest deadwood when the game ends.
-
-EXAMPLE 3 - Non-Tongits question:
-Human: How to win in Mahjong?
-
-Thought: Search the Tongits rules for "Mahjong win" to confirm coverage.
-Action: {tool_names}
-Action Input: how to win in Mahjong
-Observation: Tool returned only Tongits-related results, no Mahjong rules.
-Thought: The database contains Tongits rules but no information about Mahjong.
-Final Answer: I can't provide rules for Mahjong, since I only assist with Tongits. If you'd like, ask me any Tongits rule instead!
-
-Begin!
-"""
-
-    intent_phrases = ",".join(
-        [item.phrase_message for item in state["intent_list"] if item.intent == "game_rules"]
-    )
-
+def build_game_ruling_agent():
+    # format tools properly
+    tools = [tool_game_rules]
     prompt = ChatPromptTemplate.from_messages([
         ("system", GAME_RULES_PROMPT),
         ("system","{agent_scratchpad}"),
         ("system","{tools}")
-    ])
-    # format tools properly
-    tools = [tool_game_rules]
-    tool_descriptions = "\n".join(
-        [f"- {t.name}: {t.description}" for t in tools]
-    )
+    ]).partial(tool_descriptions="\n".join([f"- {t.name}: {t.description}" for t in tools]))
 
     agent = create_react_agent(
         llm=base_llm,
         tools=tools,
-        prompt=prompt
+        prompt=prompt,
+        tools_renderer=lambda tools: "\n".join([t.name for t in tools])
     )
-    agent_executor = AgentExecutor.from_agent_and_tools(
+    return AgentExecutor.from_agent_and_tools(
         agent=agent,
         tools=tools,
         verbose=True,
@@ -181,15 +174,23 @@ Begin!
         early_stopping_method="force",
         return_intermediate_steps=True  # Key parameter
     )
+
+runnables.register(GAME_RULING, build_game_ruling_agent)
+
+async def node_game_ruling(state: AgentState, config: RunnableConfig) -> AgentState:
+    if "game_rules" not in state.get("intent", []):
+        return state  # Skip if not relevant
+
+    intent_phrases = ",".join(
+        [item.phrase_message for item in state["intent_list"] if item.intent == "game_rules"]
+    )
+    agent_executor = runnables.get(GAME_RULING)
     with get_openai_callback() as cb:
         start_time = datetime.now()
         try:
-            llm_output = agent_executor.invoke(
+            llm_output = await agent_executor.ainvoke(
                 {
-                    "user_message": intent_phrases,
-                    "tool_descriptions": tool_descriptions,
-                    "tools": "\n".join([t.name for t in tools]),
-                    "tool_names": ", ".join([t.name for t in tools])
+                    "user_message": intent_phrases
                 },
                 config=config
             )
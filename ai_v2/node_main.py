@@ -1,6 +1,7 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.types import Send
-from langchain_core.messages import HumanMessage 
+from langchain_core.messages import HumanMessage, AIMessage
+from typing import List, Optional
 from llm_model import checkpointer
 from ai_v2.states import AgentState
 from utils.cleaner import clean_transcript
@@ -15,6 +16,7 @@ from ai_v2.node_consolidator_manager import node_consolidator_manager
 from ai_v2.node_neutral import node_neutral
 from ai_v2.node_registration import node_registration
 from ai_v2.node_msg_summarizer import node_msg_summarizer
+from ai_v2.runnables import runnables
 
 def preprocess(state: AgentState) -> AgentState:
     """Clean transcript + classify intent."""    
@@ -23,16 +25,48 @@ def preprocess(state: AgentState) -> AgentState:
     state["messages"] = HumanMessage(content=cleaned)   
     return state
 
+# Branch node answering each intent
+INTENT_NODES = {
+    "availability": "node_availability",
+    # "game_rules": "node_game_ruling",
+    "neutral": "node_neutral",
+    "registration": "node_registration"
+}
+# Branches whose output is already the reply; when one of them is the only branch of a turn the consolidator is skipped
+DIRECT_REPLY_NODES = {"node_neutral", "node_registration"}
+
+def branch_nodes(intents: Optional[List[str]]) -> List[str]:
+    return [INTENT_NODES[intent] for intent in dict.fromkeys(intents or []) if intent in INTENT_NODES]
+
+def direct_reply_node(intents: Optional[List[str]]) -> Optional[str]:
+    """The branch answering the turn on its own, if any"""
+    nodes = branch_nodes(intents)
+    if len(nodes) == 1 and nodes[0] in DIRECT_REPLY_NODES:
+        return nodes[0]
+    return None
+
 def intent_router(state: AgentState):
-    """Return multiple next nodes to fan-out in parallel."""
-    return [
-        Send("node_availability", state), 
-        # Send("node_game_ruling", state),
-        Send("node_neutral", state),
-        Send("node_registration", state)
-    ]
+    """Fan-out in parallel to the branches of the classified intents only."""
+    nodes = branch_nodes(state.get("intent"))
+    if not nodes:
+        # Nothing to look up, the consolidator answers from the conversation alone
+        return "node_consolidator_manager"
+    return [Send(node, state) for node in nodes]
+
+def branch_router(state: AgentState) -> str:
+    # A branch that failed without a reply still goes through the consolidator
+    if direct_reply_node(state.get("intent")) and state.get("raw_messages"):
+        return "node_direct_reply"
+    return "node_consolidator_manager"
+
+def node_direct_reply(state: AgentState) -> AgentState:
+    """The single branch already produced the reply, it becomes the AI message as is."""
+    return {**state, "messages": AIMessage(content=state["raw_messages"][-1])}
 
 def build_graph():
+    # Prompts, chains and agents of every node are built here once, turns only pass variables
+    runnables.build_all()
+
     graph = StateGraph(AgentState)
 
     graph.add_node("preprocess", preprocess)
@@ -43,6 +77,7 @@ def build_graph():
     graph.add_node("node_availability", node_availability) 
     graph.add_node("node_registration", node_registration)
     graph.add_node("node_consolidator_manager", node_consolidator_manager)    
+    graph.add_node("node_direct_reply", node_direct_reply)
     graph.add_node("node_msg_summarizer", node_msg_summarizer)
 
     graph.add_edge(START, "preprocess")
@@ -50,17 +85,16 @@ def build_graph():
     # Intent clasiification
     graph.add_edge("preprocess", "node_classify_intent")
 
-    # Proper fan-out (parallel execution)
-    graph.add_conditional_edges("node_classify_intent", intent_router)
+    # Proper fan-out (parallel execution), only to the branches that are needed
+    graph.add_conditional_edges("node_classify_intent", intent_router, list(INTENT_NODES.values()) + ["node_consolidator_manager"])
 
     # Parallel 
-    graph.add_edge("node_neutral", "node_consolidator_manager")
-    # graph.add_edge("node_game_ruling", "node_consolidator_manager")
-    graph.add_edge("node_availability", "node_consolidator_manager")
-    graph.add_edge("node_registration", "node_consolidator_manager")
+    for node in INTENT_NODES.values():
+        graph.add_conditional_edges(node, branch_router, ["node_consolidator_manager", "node_direct_reply"])
 
     # The consolidator job is to consolidate all the parallel responses in one 
     graph.add_edge("node_consolidator_manager", "node_msg_summarizer")
+    graph.add_edge("node_direct_reply", "node_msg_summarizer")
 
     # This is for logging purposes
     graph.add_edge("node_msg_summarizer", END)
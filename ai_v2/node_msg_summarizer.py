@@ -4,7 +4,7 @@ from llm_model import base_llm
 
 MESSAGE_COUNT = 5
 
-def node_msg_summarizer(state: AgentState, config: RunnableConfig) -> AgentState:
+async def node_msg_summarizer(state: AgentState, config: RunnableConfig) -> AgentState:
     messages = state.get("messages", [])
     
     # Get the last MESSAGE_COUNT messages
@@ -46,7 +46,7 @@ Provide a brief summary that captures the essential information and flow of the
     
     try:
         # Use the base LLM to create summary
-        summary_response = base_llm.invoke(summary_prompt, config)
+        summary_response = await base_llm.ainvoke(summary_prompt, config)
         short_message = summary_response.content if hasattr(summary_response, 'content') else str(summary_response)
         
         # Update state with the summary
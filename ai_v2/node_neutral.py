@@ -64,16 +64,9 @@ from langgraph.graph.state import RunnableConfig
 from langchain_community.callbacks.manager import get_openai_callback
 from langchain_core.prompts import ChatPromptTemplate
 from llm_model import checkpointer, base_llm
+from ai_v2.runnables import runnables, NEUTRAL
 
-def node_neutral(state: AgentState, config: RunnableConfig) -> AgentState:
-   
-    intents = state.get("intent", [])
-    if "neutral" not in intents:
-        # This node doesn't handle this intent, return empty raw_messages
-        return state
-    
-    
-    NEUTRAL_PROMPT = """
+NEUTRAL_PROMPT = """
 Your role is to respond to casual or neutral conversations, while gently encouraging interest 
 in any mentioned upcoming events — without sounding salesy.
 
@@ -109,20 +102,29 @@ Conversation summary: {conversation_summary}
 Synthesize response:
 """
 
+def build_neutral_chain():
+    return ChatPromptTemplate.from_template(NEUTRAL_PROMPT) | base_llm
+
+runnables.register(NEUTRAL, build_neutral_chain)
+
+async def node_neutral(state: AgentState, config: RunnableConfig) -> AgentState:
+   
+    intents = state.get("intent", [])
+    if "neutral" not in intents:
+        # This node doesn't handle this intent, return empty raw_messages
+        return state
 
     intent_phrases = ",".join(
         [item.phrase_message for item in state["intent_list"] if item.intent == "neutral"]
     )
-    intent_prompt = ChatPromptTemplate.from_template(NEUTRAL_PROMPT)
-
-    chain = intent_prompt | base_llm 
+    chain = runnables.get(NEUTRAL)
 
     with get_openai_callback() as cb:
         start_time = datetime.now()
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "intent_phrases": intent_phrases,
             "conversation_summary": state.get("short_message","")
-        })
+        }, config=config)
 
         print("**********************************")        
         print("--- node_neutral ---")
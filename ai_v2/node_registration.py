@@ -5,28 +5,9 @@ from ai_v2.states import AgentState
 from langchain_core.runnables import RunnableConfig
 from llm_model import base_llm
 from langchain_community.callbacks.manager import get_openai_callback
+from ai_v2.runnables import runnables, REGISTRATION
 
-def node_registration(state: AgentState, config: RunnableConfig) -> AgentState:
-    """Handles user registration with Clear Extraction and State Update Workflow"""
-
-    intents = state.get("intent", [])
-    if "registration" not in intents:
-        return state  # This node doesn't handle other intents
-
-    # Existing registration form data
-    reg_form = {
-        "fullname": state.get("fullname",""),
-        "email": state.get("email",""),
-        "nickname": state.get("nickname",""),
-        "event_details": state.get("event_details","")
-    }
-
-    # Collect registration intent-related phrase messages    
-    intent_phrases = ",".join(
-        [item.phrase_message for item in state["intent_list"] if item.intent == "registration"]
-    )
-
-    PROMPT_INSTRUCTION = """Your role is to identify and extract information from the user's message. Your response will be a strict JSON format.
+PROMPT_INSTRUCTION = """Your role is to identify and extract information from the user's message. Your response will be a strict JSON format.
 
 KEYPOINTS TO LOOK AT:
 - Giving information such as fullname, nickname, or email that are used to identify the user for event registration.
@@ -79,18 +60,42 @@ Summary of conversation:
 
 Respond *ONLY* with valid JSON in the described formats. No additional text or explanation.
 """
-    
+
+def build_registration_chain():
+    return ChatPromptTemplate.from_template(PROMPT_INSTRUCTION) | base_llm
+
+runnables.register(REGISTRATION, build_registration_chain)
+
+async def node_registration(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Handles user registration with Clear Extraction and State Update Workflow"""
+
+    intents = state.get("intent", [])
+    if "registration" not in intents:
+        return state  # This node doesn't handle other intents
+
+    # Existing registration form data
+    reg_form = {
+        "fullname": state.get("fullname",""),
+        "email": state.get("email",""),
+        "nickname": state.get("nickname",""),
+        "event_details": state.get("event_details","")
+    }
+
+    # Collect registration intent-related phrase messages    
+    intent_phrases = ",".join(
+        [item.phrase_message for item in state["intent_list"] if item.intent == "registration"]
+    )
+
     try:
-    
-        chain = ChatPromptTemplate.from_template(PROMPT_INSTRUCTION) | base_llm 
+        chain = runnables.get(REGISTRATION)
 
         with get_openai_callback() as cb:
             start_time = datetime.now()
-            response = chain.invoke({
+            response = await chain.ainvoke({
                 "reg_form": json.dumps(reg_form),
                 "intent_phrases": intent_phrases,
                 "conversation_summary": state.get("short_message","")
-            })
+            }, config=config)
             elapsed = (datetime.now() - start_time).total_seconds()
             
             print("**********************************")        
@@ -0,0 +1,50 @@
+""" Prompts, chains and agents of the ai_v2 graph, built once and shared by every turn """
+import threading
+from typing import Callable, Dict
+from langchain_core.runnables import Runnable
+
+CLASSIFY_INTENT = "classify_intent"
+AVAILABILITY = "availability"
+GAME_RULING = "game_ruling"
+NEUTRAL = "neutral"
+REGISTRATION = "registration"
+CONSOLIDATOR = "consolidator"
+
+class RunnableRegistry:
+    """Builds each registered runnable once and reuses it afterwards.
+
+    The runnables hold no per-turn state, so a single instance serves every
+    conversation (and concurrent branches); per-call values are passed as
+    input variables only.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], Runnable]] = {}
+        self._built: Dict[str, Runnable] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, builder: Callable[[], Runnable]):
+        with self._lock:
+            self._builders[name] = builder
+
+    def get(self, name: str) -> Runnable:
+        runnable = self._built.get(name)
+        if runnable is not None:
+            return runnable
+        if name not in self._builders:
+            raise KeyError(f"Unknown runnable: {name}")
+
+        with self._lock:
+            runnable = self._built.get(name)
+            if runnable is None:
+                runnable = self._builders[name]()
+                self._built[name] = runnable
+        return runnable
+
+    def build_all(self):
+        """Called by build_graph so no turn pays for prompt parsing or agent construction"""
+        for name in list(self._builders):
+            self.get(name)
+
+
+runnables = RunnableRegistry()
@@ -1,4 +1,4 @@
-from collection_db import chroma_client, embedder, GAME_COLLECTION_NAME
+from collection_db import chroma_client, GAME_COLLECTION_NAME
 from langchain_core.tools import tool
 from ai_v2.states import AgentState
 
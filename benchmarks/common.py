@@ -0,0 +1,78 @@
+""" Shared helpers for the offline benchmarks """
+import os
+import re
+import json
+import psutil
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Sequence
+from schema.sound import STT_SAMPLE_RATE
+
+FIXTURES_FOLDER = os.path.join(os.path.dirname(__file__), "fixtures")
+
+@dataclass
+class Fixture:
+    name: str
+    audio: np.ndarray  # float32, 16kHz mono
+    reference: str
+
+    @property
+    def seconds(self) -> float:
+        return len(self.audio) / STT_SAMPLE_RATE
+
+
+def load_fixtures(folder: str = FIXTURES_FOLDER) -> List[Fixture]:
+    """Every `<name>.wav` with a `<name>.txt` reference transcript next to it"""
+    from faster_whisper import decode_audio
+
+    fixtures = []
+    if not os.path.isdir(folder):
+        return fixtures
+    for file in sorted(os.listdir(folder)):
+        name, ext = os.path.splitext(file)
+        reference_path = os.path.join(folder, f"{name}.txt")
+        if ext != ".wav" or not os.path.exists(reference_path):
+            continue
+        with open(reference_path, encoding="utf-8") as f:
+            reference = f.read().strip()
+        audio = decode_audio(os.path.join(folder, file), sampling_rate=STT_SAMPLE_RATE)
+        fixtures.append(Fixture(name, audio, reference))
+    return fixtures
+
+def normalize_words(text: str) -> List[str]:
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_errors(reference: str, hypothesis: str) -> int:
+    """Word-level edit distance (substitutions + insertions + deletions)"""
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            ))
+        previous = current
+    return previous[-1]
+
+def word_error_rate(references: Sequence[str], hypotheses: Sequence[str]) -> float:
+    """Corpus WER: total word errors over total reference words"""
+    errors = sum(word_errors(ref, hyp) for ref, hyp in zip(references, hypotheses))
+    words = sum(len(normalize_words(ref)) for ref in references)
+    return errors / words if words else 0.0
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 2**20
+
+def print_table(rows: List[dict], columns: Sequence[str]):
+    widths = {column: max([len(column)] + [len(str(row.get(column, ""))) for row in rows]) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row.get(column, "")).ljust(widths[column]) for column in columns))
+
+def write_json(rows: List[dict], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+    print(f"💾 Results written to {path}")
@@ -0,0 +1,61 @@
+""" Synthesize the benchmark fixtures with the local Piper voice
+
+    python -m benchmarks.generate_fixtures
+
+Writes benchmarks/fixtures/<name>.wav (16kHz mono PCM16) with the sentence
+in <name>.txt. Piper's noise is disabled so the same voice model always
+produces the same audio.
+"""
+import os
+import argparse
+import numpy as np
+import soundfile as sf
+from schema.sound import STT_SAMPLE_RATE
+from benchmarks.common import FIXTURES_FOLDER
+
+# Short confirmations dominate the registration flow, the rest covers typical questions
+SENTENCES = {
+    "yes": "Yes.",
+    "no_thanks": "No, thank you.",
+    "confirm_name": "My name is Maria Santos.",
+    "availability": "I am free on Saturday afternoon after two o'clock.",
+    "register": "I would like to register for the Tongits tournament next Friday.",
+    "event_question": "What events are happening this weekend, and do I need to bring my own cards?",
+    "rules_question": "Can you explain how many cards each player gets at the start of a Tongits game?",
+    "long_request": (
+        "Hi, I signed up last week but I cannot make it on Friday anymore because of work, "
+        "so could you move my registration to the Sunday session and let me know what time it starts?"
+    ),
+}
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    if source_rate == target_rate:
+        return audio
+    duration = len(audio) / source_rate
+    target = np.linspace(0, duration, int(duration * target_rate), endpoint=False)
+    return np.interp(target, np.arange(len(audio)) / source_rate, audio).astype(np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=FIXTURES_FOLDER)
+    args = parser.parse_args()
+
+    from piper import SynthesisConfig
+    from model_registry import models, PIPER
+
+    voice = models.get(PIPER)
+    deterministic = SynthesisConfig(noise_scale=0.0, noise_w_scale=0.0)
+    os.makedirs(args.out, exist_ok=True)
+
+    for name, sentence in SENTENCES.items():
+        chunks = list(voice.synthesize(sentence, syn_config=deterministic))
+        audio = np.concatenate([chunk.audio_float_array for chunk in chunks])
+        audio = resample(audio, chunks[0].sample_rate, STT_SAMPLE_RATE)
+
+        sf.write(os.path.join(args.out, f"{name}.wav"), audio, STT_SAMPLE_RATE, subtype="PCM_16")
+        with open(os.path.join(args.out, f"{name}.txt"), "w", encoding="utf-8") as f:
+            f.write(sentence + "\n")
+        print(f"✅ {name}: {len(audio) / STT_SAMPLE_RATE:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+""" Held-out accuracy of the embedding intent fast path per threshold pair
+
+    python -m benchmarks.intent --json intent.json
+
+Runs CentroidIntentClassifier over labeled messages that are not among its
+EXAMPLES. Multi-intent messages are labeled None: the fast path must defer
+them to the LLM. For every (min_score, min_margin) pair it reports:
+coverage (single-intent messages answered without the LLM), accuracy of those
+answers, and wrong (answers that are not the label, multi-intent ones included).
+The row of the current INTENT_FAST_PATH_* defaults is marked with *.
+"""
+import time
+import argparse
+import numpy as np
+from typing import List, Optional, Tuple
+from schema.sound import INTENT_FAST_PATH_MIN_SCORE, INTENT_FAST_PATH_MIN_MARGIN
+from benchmarks.common import print_table, write_json
+
+COLUMNS = ["", "min_score", "min_margin", "coverage", "accuracy", "wrong", "p50_ms"]
+
+HELD_OUT: List[Tuple[str, Optional[str]]] = [
+    ("Are there any events this Saturday?", "availability"),
+    ("When's the next Tongits night?", "availability"),
+    ("What do you have coming up this month?", "availability"),
+    ("Is anything scheduled for Friday evening?", "availability"),
+    ("Where will the tournament take place?", "availability"),
+    ("What time does it start tomorrow?", "availability"),
+    ("Do you run any workshops for new players?", "availability"),
+    ("How many events are there next week?", "availability"),
+    ("I want to sign up.", "registration"),
+    ("Please add me to the list.", "registration"),
+    ("Put me down for Sunday's game.", "registration"),
+    ("Yes, go ahead.", "registration"),
+    ("Sure, register me.", "registration"),
+    ("My full name is Carlo Reyes.", "registration"),
+    ("You can reach me at carlo@example.com.", "registration"),
+    ("Call me Jojo.", "registration"),
+    ("I'll join the beginner session.", "registration"),
+    ("Hey!", "neutral"),
+    ("Good evening.", "neutral"),
+    ("Thanks a lot.", "neutral"),
+    ("Cool, thank you.", "neutral"),
+    ("Bye for now.", "neutral"),
+    ("How are you doing today?", "neutral"),
+    ("Who are you?", "neutral"),
+    ("That sounds fun.", "neutral"),
+    ("Hi. Register me please.", None),
+    ("Hello! What events do you have? I'd like to join.", None),
+    ("Is there an event this weekend? You can sign me up as Osmar.", None),
+    ("Thanks. When is the next tournament?", None),
+]
+
+def evaluate(classifier, min_score: float, min_margin: float) -> dict:
+    classifier.min_score = min_score
+    classifier.min_margin = min_margin
+    single = [(text, label) for text, label in HELD_OUT if label is not None]
+
+    answered = correct = wrong = 0
+    latencies = []
+    for text, label in HELD_OUT:
+        started = time.perf_counter()
+        result = classifier.predict(text)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if result is None:
+            continue
+        intents = [item.intent for item in result]
+        if label is None or intents != [label]:
+            wrong += 1
+        else:
+            correct += 1
+        if label is not None:
+            answered += 1
+
+    defaults = (min_score, min_margin) == (INTENT_FAST_PATH_MIN_SCORE, INTENT_FAST_PATH_MIN_MARGIN)
+    return {
+        "": "*" if defaults else "",
+        "min_score": min_score,
+        "min_margin": min_margin,
+        "coverage": round(answered / len(single), 3),
+        "accuracy": round(correct / answered, 3) if answered else 0.0,
+        "wrong": wrong,
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-scores", type=float, nargs="+", default=[0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7])
+    parser.add_argument("--min-margins", type=float, nargs="+", default=[0.05, 0.1, 0.15, 0.2])
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    from ai_v2.intent_fast_path import CentroidIntentClassifier
+    classifier = CentroidIntentClassifier()
+    classifier.centroids  # loads the embedder and builds the centroids outside the timings
+
+    pairs = sorted(set(
+        [(score, margin) for score in args.min_scores for margin in args.min_margins]
+        + [(INTENT_FAST_PATH_MIN_SCORE, INTENT_FAST_PATH_MIN_MARGIN)]
+    ))
+    rows = [evaluate(classifier, score, margin) for score, margin in pairs]
+
+    print_table(rows, COLUMNS)
+    if args.json:
+        write_json(rows, args.json)
+
+if __name__ == "__main__":
+    main()
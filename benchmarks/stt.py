@@ -0,0 +1,102 @@
+""" Transcription latency, real-time factor and WER of each STT engine
+
+    python -m benchmarks.stt --engines whispercpp faster_whisper --repeat 3
+
+Fixtures come from benchmarks.generate_fixtures. Every utterance goes through the
+same entry point as /stream/voicein (transcribe_pcm with PCM16 bytes), one at a
+time, with the transcript cache disabled.
+"""
+import time
+import asyncio
+import argparse
+import numpy as np
+from typing import Callable, Dict
+from benchmarks.common import FIXTURES_FOLDER, load_fixtures, word_error_rate, print_table, write_json
+
+COLUMNS = ["engine", "utterances", "first_s", "p50_ms", "p95_ms", "max_ms", "rtf", "wer"]
+
+def _whispercpp():
+    from repository.voicecpp import VoiceRepositoryCpp
+    return VoiceRepositoryCpp()
+
+def _faster_whisper():
+    from repository.voice import VoiceRepository
+    return VoiceRepository()
+
+# Anything exposing async transcribe_pcm(pcm) -> (text, succeed) can be added here
+ENGINES: Dict[str, Callable] = {
+    "whispercpp": _whispercpp,
+    "faster_whisper": _faster_whisper,
+}
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+async def bench_engine(name: str, fixtures, repeat: int) -> dict:
+    engine = ENGINES[name]()
+    pcm16 = {fixture.name: (fixture.audio * 32767).astype(np.int16).tobytes() for fixture in fixtures}
+
+    # First call includes model loading and warm-up, it is reported on its own
+    started = time.perf_counter()
+    await engine.transcribe_pcm(pcm16[fixtures[0].name])
+    first = time.perf_counter() - started
+
+    latencies = []
+    decode_seconds = 0.0
+    hypotheses = []
+    for _ in range(repeat):
+        hypotheses = []
+        for fixture in fixtures:
+            started = time.perf_counter()
+            text, succeed = await engine.transcribe_pcm(pcm16[fixture.name])
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed * 1000)
+            decode_seconds += elapsed
+            hypotheses.append(text if succeed else "")
+
+    audio_seconds = sum(fixture.seconds for fixture in fixtures) * repeat
+    return {
+        "engine": name,
+        "utterances": len(latencies),
+        "first_s": round(first, 2),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "max_ms": round(max(latencies), 1),
+        "rtf": round(decode_seconds / audio_seconds, 3),
+        "wer": round(word_error_rate([fixture.reference for fixture in fixtures], hypotheses), 4)
+    }
+
+async def run(args):
+    from repository.transcript_cache import transcript_cache
+    from repository.whisper_engine import whisper_engine
+    transcript_cache.max_entries = 0  # a cache hit is not a decode
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"❌ No fixtures found in {args.fixtures}, run python -m benchmarks.generate_fixtures first")
+        return
+    print(f"🎧 {len(fixtures)} fixtures, {sum(f.seconds for f in fixtures):.1f}s of audio")
+
+    rows = []
+    try:
+        for name in args.engines:
+            print(f"⏱️ {name}")
+            rows.append(await bench_engine(name, fixtures, args.repeat))
+    finally:
+        whisper_engine.shutdown()
+
+    print()
+    print_table(rows, COLUMNS)
+    if args.json:
+        write_json(rows, args.json)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--fixtures", default=FIXTURES_FOLDER)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write the results to this file")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+""" Piper synthesis throughput
+
+    python -m benchmarks.tts --repeat 3
+
+Streams the fixture sentences through TTSRepository (without its cache) and
+reports time to first chunk, real-time factor and characters per second.
+"""
+import time
+import asyncio
+import argparse
+import numpy as np
+from schema.sound import VOICE_MODEL_PATH
+from benchmarks.common import print_table, write_json
+from benchmarks.generate_fixtures import SENTENCES
+
+COLUMNS = ["sentences", "first_s", "first_chunk_p50_ms", "first_chunk_p95_ms", "rtf", "chars_per_s", "audio_s_per_s"]
+
+async def run(args):
+    from repository.tts import TTSRepository
+    tts = TTSRepository(VOICE_MODEL_PATH, cache=None)
+    sentences = list(SENTENCES.values())
+
+    # Model loading and ONNX session warm-up, reported on its own
+    started = time.perf_counter()
+    async for _ in tts.stream(sentences[0]):
+        pass
+    first = time.perf_counter() - started
+
+    first_chunk_ms = []
+    synth_seconds = 0.0
+    audio_bytes = 0
+    chars = 0
+    for _ in range(args.repeat):
+        for sentence in sentences:
+            started = time.perf_counter()
+            first_chunk = None
+            async for pcm16 in tts.stream(sentence):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                audio_bytes += len(pcm16)
+            synth_seconds += time.perf_counter() - started
+            first_chunk_ms.append(first_chunk * 1000)
+            chars += len(sentence)
+
+    audio_seconds = audio_bytes / 2 / tts.sample_rate
+    rows = [{
+        "sentences": len(first_chunk_ms),
+        "first_s": round(first, 2),
+        "first_chunk_p50_ms": round(float(np.percentile(first_chunk_ms, 50)), 1),
+        "first_chunk_p95_ms": round(float(np.percentile(first_chunk_ms, 95)), 1),
+        "rtf": round(synth_seconds / audio_seconds, 3),
+        "chars_per_s": round(chars / synth_seconds, 1),
+        "audio_s_per_s": round(audio_seconds / synth_seconds, 2)
+    }]
+
+    print_table(rows, COLUMNS)
+    if args.json:
+        write_json(rows, args.json)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write the results to this file")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+""" Real-time factor, memory and WER of faster-whisper per model size and compute type
+
+    python -m benchmarks.whisper_compute_types --sizes base medium --compute-types float32 int8_float32 int8
+
+Each configuration runs in a fresh process so its memory is measured on its own.
+"""
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from schema.sound import STT_LANGUAGE, STT_BEAM_SIZE, FASTER_WHISPER_CPU_THREADS
+from benchmarks.common import FIXTURES_FOLDER, load_fixtures, word_error_rate, rss_mb, print_table, write_json
+
+COLUMNS = ["size", "compute_type", "load_s", "model_mb", "peak_mb", "rtf", "wer", "error"]
+
+def run_config(size: str, compute_type: str, fixtures_folder: str, cpu_threads: int, warmup: bool) -> dict:
+    """Runs inside its own worker process"""
+    from model_registry import load_faster_whisper
+
+    fixtures = load_fixtures(fixtures_folder)
+    row = {"size": size, "compute_type": compute_type}
+    baseline = rss_mb()
+    started = time.perf_counter()
+    try:
+        model = load_faster_whisper(size, compute_type, cpu_threads)
+    except ValueError as e:  # compute type not supported on this CPU
+        row["error"] = str(e)
+        return row
+    row["load_s"] = round(time.perf_counter() - started, 2)
+    row["model_mb"] = round(rss_mb() - baseline, 1)
+
+    def transcribe(audio) -> str:
+        segments, _ = model.transcribe(audio, language=STT_LANGUAGE, beam_size=STT_BEAM_SIZE)
+        return " ".join(segment.text.strip() for segment in segments)
+
+    if warmup:
+        transcribe(fixtures[0].audio)
+
+    hypotheses = []
+    peak = rss_mb()
+    decode_seconds = 0.0
+    for fixture in fixtures:
+        started = time.perf_counter()
+        hypotheses.append(transcribe(fixture.audio))
+        decode_seconds += time.perf_counter() - started
+        peak = max(peak, rss_mb())
+
+    audio_seconds = sum(fixture.seconds for fixture in fixtures)
+    row["peak_mb"] = round(peak - baseline, 1)
+    row["rtf"] = round(decode_seconds / audio_seconds, 3)
+    row["wer"] = round(word_error_rate([fixture.reference for fixture in fixtures], hypotheses), 4)
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=["base", "small", "medium"])
+    parser.add_argument("--compute-types", nargs="+", default=["float32", "int8_float32", "int8"])
+    parser.add_argument("--fixtures", default=FIXTURES_FOLDER, help="folder of <name>.wav + <name>.txt pairs")
+    parser.add_argument("--cpu-threads", type=int, default=FASTER_WHISPER_CPU_THREADS)
+    parser.add_argument("--no-warmup", action="store_true", help="include the first decode in the timings")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"❌ No fixtures found in {args.fixtures}, run python -m benchmarks.generate_fixtures first")
+        return
+    print(f"🎧 {len(fixtures)} fixtures, {sum(f.seconds for f in fixtures):.1f}s of audio")
+
+    rows = []
+    spawn = multiprocessing.get_context("spawn")
+    for size in args.sizes:
+        for compute_type in args.compute_types:
+            print(f"⏱️ {size} / {compute_type}")
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                rows.append(pool.submit(
+                    run_config, size, compute_type, args.fixtures, args.cpu_threads, not args.no_warmup
+                ).result())
+
+    print()
+    print_table(rows, COLUMNS)
+    if args.json:
+        write_json(rows, args.json)
+
+if __name__ == "__main__":
+    main()
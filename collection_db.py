@@ -2,8 +2,8 @@ import chromadb
 import fitz
 import json
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from model_registry import models, EMBEDDER
 
 GAME_COLLECTION_NAME = "TONGITS_RULES"
 # Global variable to store the collection
@@ -12,8 +12,9 @@ GAME_RULES_PATH = r"D:\development\stt\game_rules"
 # Initialize ChromaDB
 CHOROMA_PERSIST_PATH = Path(GAME_RULES_PATH) / "chroma_persist"
 chroma_client = chromadb.PersistentClient(path=CHOROMA_PERSIST_PATH)
-# Load local embedding model (free, no API key)
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+# Local embedding model (free, no API key), loaded by the registry on first use
+def get_embedder():
+    return models.get(EMBEDDER)
 
 json_filename = "tongits.jsonl"
 JSON_PATH = Path(GAME_RULES_PATH) / json_filename
@@ -48,7 +49,7 @@ def initialize_chroma_collection():
         # --- Step 2. Embed & store documents in Chroma ---
         for d in docs:
             text = f"Q: {d['question']} A: {d['answer']}"
-            embedding = embedder.encode(text).tolist()
+            embedding = get_embedder().encode(text).tolist()
             
             collection.add(
                 ids=[d["id"]],
@@ -7,7 +7,8 @@ from langchain_core.tools import tool
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableConfig
-from collection_db import chroma_client, embedder, GAME_COLLECTION_NAME
+from collection_db import chroma_client, get_embedder, GAME_COLLECTION_NAME
+from utils.executors import embedding_pool
 from typing import Optional
 from langchain_community.callbacks.manager import get_openai_callback
 
@@ -36,7 +37,7 @@ def game_ruling(query: str, top_k: int = 3) -> str:
                 return f"No documents found in collection '{conversation_thread_id}'."
 
             try:
-                query_embedding = embedder.encode(query)
+                query_embedding = embedding_pool.call(get_embedder().encode, query)
                 
                 query_embedding = query_embedding.tolist()
                 
@@ -131,7 +132,7 @@ def search_conversation_history(
         
         # Generate embedding for the search query
         try:
-            query_embedding = embedder.encode(query).tolist()
+            query_embedding = embedding_pool.call(get_embedder().encode, query).tolist()
         except Exception as e:
             return f"Error generating embedding for query: {str(e)}"
         
@@ -4,7 +4,8 @@ from datetime import datetime
 from llm.states import SharedState
 from sentence_transformers import SentenceTransformer
 from langchain_core.runnables import RunnableConfig
-from collection_db import chroma_client, embedder
+from collection_db import chroma_client, get_embedder
+from utils.executors import embedding_pool
 
 async def save_full_conversation(state: SharedState, config: RunnableConfig):
     """ Save full conversation here including AI Responses """
@@ -72,7 +73,7 @@ async def save_full_conversation(state: SharedState, config: RunnableConfig):
     # Add documents to collection if we have any
     if documents:
         # Generate embeddings using the embedder
-        embeddings = [embedder.encode(doc).tolist() for doc in documents]
+        embeddings = (await embedding_pool.run(get_embedder().encode, documents)).tolist()
 
         collection.add(
             documents=documents,
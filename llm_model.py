@@ -22,5 +22,7 @@ def setup_persistence(persistence_type="memory"):
 
 
 # Module-level variables that will be initialized
+# base_llm is shared by every ai_v2 node: its async client keeps one connection pool to Ollama,
+# so parallel branches (ainvoke) overlap their waits without blocking the event loop
 base_llm = ChatOllama(model=LLM_MODEL, temperature=LLM_TEMPERATURE, base_url=OLLAMA_BASE_URL, num_ctx=8192, num_predict=4080)
 checkpointer = setup_persistence()
@@ -9,6 +9,12 @@ from routes.stream import router as stream_route
 from contextlib import asynccontextmanager
 from database import init_db
 from collection_db import initialize_chroma_collection
+from repository.whisper_engine import whisper_engine
+from utils.executors import shutdown_pools
+from utils.tracing import recorder
+from fastapi.responses import JSONResponse
+from schema.sound import WARMUP
+from utils.warmup import start_warm_up, readiness
 # from llm_model import init_model
 
 @asynccontextmanager
@@ -16,7 +22,13 @@ async def lifespan(_: FastAPI):
     initialize_chroma_collection()
     init_db()
     # init_model()
+    # PRELOAD_MODELS load in the background (and with WARMUP every model is warmed), /ready reports when they are done
+    warmup_task = start_warm_up(WARMUP)
     yield
+    warmup_task.cancel()
+    whisper_engine.shutdown()
+    shutdown_pools()
+    recorder.close()
 
 app = FastAPI(
     title="Event organizer",
@@ -42,6 +54,14 @@ app.include_router(auth_route)
 app.include_router(pub_route)
 app.include_router(stream_route)
 
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once every model has been warmed up, 503 until then (failed warm-ups are retried with backoff)"""
+    return JSONResponse(
+        {"ready": readiness.ready, "components": readiness.components},
+        status_code=200 if readiness.ready else 503
+    )
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
@@ -0,0 +1,157 @@
+""" Lazily loaded, process-wide models """
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+import numpy as np
+import psutil
+from schema.sound import (
+    STT_SAMPLE_RATE, STT_LANGUAGE, STT_BEAM_SIZE, VOICE_MODEL_PATH, VOICE_CONFIG_PATH, FASTER_WHISPER_MODEL, FASTER_WHISPER_COMPUTE_TYPE, FASTER_WHISPER_CPU_THREADS,
+    STT_TIER_FAST_MODEL, STT_TIER_FAST_COMPUTE_TYPE, EMBEDDING_MODEL
+)
+
+FASTER_WHISPER = "faster_whisper"
+FASTER_WHISPER_FAST = "faster_whisper_fast"  # first tier of STT_TIERING
+PIPER = "piper"
+EMBEDDER = "embedder"
+
+@dataclass
+class LoadedModel:
+    model: Any
+    load_seconds: float
+    rss_delta_bytes: int
+    overlapped: bool  # other loads ran at the same time, so the RSS delta is shared between them
+
+
+class ModelRegistry:
+    """Loads each registered model on first use and keeps it for the life of the process.
+
+    Loads are guarded per model, so concurrent callers wait for the single load
+    while different models may load in parallel. Memory is accounted as the
+    process RSS growth during the load.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._warmups: Dict[str, Optional[Callable[[Any], Any]]] = {}
+        self._loaded: Dict[str, LoadedModel] = {}
+        self._warmed: Set[str] = set()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._loading = 0
+        self._process = psutil.Process()
+
+    def register(self, name: str, loader: Callable[[], Any], warmup: Optional[Callable[[Any], Any]] = None):
+        """`warmup` runs one dummy inference so first-call costs are paid before real traffic"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._warmups[name] = warmup
+            self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        loaded = self._loaded.get(name)
+        if loaded is not None:
+            return loaded.model
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            loaded = self._loaded.get(name)
+            if loaded is None:
+                loaded = self._load(name)
+                self._loaded[name] = loaded
+        return loaded.model
+
+    def _load(self, name: str) -> LoadedModel:
+        with self._lock:
+            self._loading += 1
+            overlapped = self._loading > 1
+        print(f"⏳ Loading model {name}")
+        rss_before = self._process.memory_info().rss
+        started = time.perf_counter()
+        try:
+            model = self._loaders[name]()
+        finally:
+            with self._lock:
+                self._loading -= 1
+                overlapped = overlapped or self._loading > 0
+        loaded = LoadedModel(
+            model=model,
+            load_seconds=time.perf_counter() - started,
+            rss_delta_bytes=self._process.memory_info().rss - rss_before,
+            overlapped=overlapped
+        )
+        print(f"✅ Model {name} loaded in {loaded.load_seconds:.2f}s (+{loaded.rss_delta_bytes / 2**20:.0f} MB)")
+        return loaded
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def warm(self, name: str):
+        """Blocking; load the model and run its warm-up inference once"""
+        model = self.get(name)
+        warmup = self._warmups.get(name)
+        if warmup is None or name in self._warmed:
+            return
+        with self._locks[name]:
+            if name not in self._warmed:
+                warmup(model)
+                self._warmed.add(name)
+
+    def preload(self, names: Iterable[str]):
+        """Blocking; load the given models now instead of on first use"""
+        for name in names:
+            self.get(name)
+
+    def stats(self) -> dict:
+        per_model = {}
+        for name in self._loaders:
+            loaded = self._loaded.get(name)
+            if loaded is None:
+                per_model[name] = {"loaded": False}
+                continue
+            per_model[name] = {
+                "loaded": True,
+                "warmed": name in self._warmed,
+                "load_seconds": round(loaded.load_seconds, 2),
+                "rss_delta_mb": round(loaded.rss_delta_bytes / 2**20, 1),
+                "overlapped": loaded.overlapped
+            }
+        return {"rss_mb": round(self._process.memory_info().rss / 2**20, 1), "models": per_model}
+
+
+def load_faster_whisper(size: str = FASTER_WHISPER_MODEL, compute_type: str = FASTER_WHISPER_COMPUTE_TYPE,
+                        cpu_threads: int = FASTER_WHISPER_CPU_THREADS):
+    from faster_whisper import WhisperModel
+    return WhisperModel(size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+
+def _load_piper():
+    from piper.voice import PiperVoice
+    return PiperVoice.load(VOICE_MODEL_PATH, VOICE_CONFIG_PATH)
+
+def _load_embedder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+# Warm-ups: CTranslate2 kernel selection, ONNX graph optimization, tokenizer init
+def _warm_faster_whisper(model):
+    segments, _ = model.transcribe(np.zeros(STT_SAMPLE_RATE, dtype=np.float32), language=STT_LANGUAGE, beam_size=STT_BEAM_SIZE)
+    list(segments)
+
+def _warm_piper(voice):
+    for _ in voice.synthesize("Warming up."):
+        pass
+
+def _warm_embedder(embedder):
+    embedder.encode("warming up")
+
+
+models = ModelRegistry()
+models.register(FASTER_WHISPER, load_faster_whisper, _warm_faster_whisper)
+models.register(
+    FASTER_WHISPER_FAST,
+    lambda: load_faster_whisper(STT_TIER_FAST_MODEL, STT_TIER_FAST_COMPUTE_TYPE),
+    _warm_faster_whisper
+)
+models.register(PIPER, _load_piper, _warm_piper)
+models.register(EMBEDDER, _load_embedder, _warm_embedder)
@@ -0,0 +1,100 @@
+""" Partial (sliding-window) transcription of the utterance in progress """
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+from schema.sound import STT_SAMPLE_RATE, PARTIAL_STEP_MS, PARTIAL_MAX_WINDOW_MS, PARTIAL_MIN_TAIL_MS
+
+def _ms_to_bytes(ms: int, sample_rate: int) -> int:
+    return int(sample_rate * ms / 1000) * 2  # int16=2 bytes
+
+
+class StreamingTranscriber:
+    """Re-decodes the growing tail of one utterance while it is being spoken.
+
+    Once the uncommitted tail grows past the max window, the audio up to the
+    latest pause is decoded one last time and its text becomes a stable
+    prefix: it is never re-decoded, neither for later partials nor for the
+    final transcript. One instance lives for exactly one utterance.
+    """
+
+    def __init__(
+        self,
+        voice,
+        sample_rate: int = STT_SAMPLE_RATE,
+        step_ms: int = PARTIAL_STEP_MS,
+        max_window_ms: int = PARTIAL_MAX_WINDOW_MS,
+        min_tail_ms: int = PARTIAL_MIN_TAIL_MS
+    ):
+        self.voice = voice  # anything exposing async transcribe_pcm()
+        self.step_bytes = _ms_to_bytes(step_ms, sample_rate)
+        self.max_window_bytes = _ms_to_bytes(max_window_ms, sample_rate)
+        self.min_tail_bytes = _ms_to_bytes(min_tail_ms, sample_rate)
+
+        self.committed_text: List[str] = []
+        self.committed_bytes = 0
+        self._decoded_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def update(self, audio: memoryview, pause_at: int, on_partial: Callable[[str], Awaitable[None]]):
+        """Schedule a partial decode if enough new audio arrived and none is running.
+
+        `audio` is the utterance so far and `pause_at` the offset right after its
+        latest unvoiced frame (0 if none). The tail is copied before returning,
+        so the caller's buffer can be reused right away.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        if len(audio) - self._decoded_bytes < self.step_bytes:
+            return
+        self._decoded_bytes = len(audio)
+
+        commit_len = 0
+        if len(audio) - self.committed_bytes > self.max_window_bytes:
+            cut = pause_at if pause_at > self.committed_bytes else len(audio)
+            commit_len = cut - self.committed_bytes
+
+        tail = bytes(audio[self.committed_bytes:])
+        self._task = asyncio.create_task(self._partial(tail, commit_len, on_partial))
+
+    async def _partial(self, tail: bytes, commit_len: int, on_partial: Callable[[str], Awaitable[None]]):
+        try:
+            view = memoryview(tail)
+            if commit_len:
+                text, succeed = await self.voice.transcribe_pcm(view[:commit_len])
+                if succeed and text:
+                    self.committed_text.append(text)
+                self.committed_bytes += commit_len
+                view = view[commit_len:]
+
+            hypothesis = ""
+            if len(view) >= self.min_tail_bytes:
+                text, succeed = await self.voice.transcribe_pcm(view)
+                if succeed:
+                    hypothesis = text
+
+            partial_text = self._join(hypothesis)
+            if partial_text:
+                await on_partial(partial_text)
+        except Exception as e:
+            print("⚠️ Partial transcription failed:", e)
+
+    def cancel(self):
+        """Stop the partial decode in flight, if any (the utterance was dropped or the socket closed)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def final(self, audio: bytes):
+        """Decode only what follows the stable prefix and return (text, succeed)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        text, succeed = await self.voice.transcribe_pcm(memoryview(audio)[self.committed_bytes:])
+        if not self.committed_text:
+            return text, succeed
+        return self._join(text if succeed else ""), True
+
+    def _join(self, tail_text: str) -> str:
+        return " ".join([*self.committed_text, tail_text]).strip()
@@ -0,0 +1,176 @@
+""" Cross-session batched transcription on faster-whisper """
+import asyncio
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional
+from faster_whisper.audio import pad_or_trim
+from faster_whisper.tokenizer import Tokenizer
+from schema.sound import (
+    STT_SAMPLE_RATE, STT_BATCH_WINDOW_MS, STT_BATCH_MAX, STT_LANGUAGE, STT_BEAM_SIZE,
+    STT_TIERING, STT_TIER_MAX_SECONDS, STT_TIER_MIN_LOGPROB, STT_TIER_MAX_NO_SPEECH
+)
+from model_registry import models, FASTER_WHISPER, FASTER_WHISPER_FAST
+from utils.executors import stt_pool
+
+# Whisper decodes 30 second windows; longer audio goes through the regular long-form path
+MAX_BATCH_SAMPLES = 30 * STT_SAMPLE_RATE
+
+@dataclass
+class TranscriptionResult:
+    text: str
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
+
+
+class BatchTranscriptionScheduler:
+    """Collects utterances from every WebSocket session and /api/transcribe call
+    for a short window, runs them as one batched inference and fans the results
+    back out to the waiting coroutines.
+    """
+
+    def __init__(self, model=None, model_name: str = FASTER_WHISPER,
+                 window_ms: int = STT_BATCH_WINDOW_MS, max_batch: int = STT_BATCH_MAX):
+        self._model = model
+        self.model_name = model_name
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[tuple] = []
+        self._drainer: Optional[asyncio.Task] = None
+        self._tokenizer = None
+
+    @property
+    def model(self):
+        """The shared faster-whisper model, loaded by the registry on first use"""
+        if self._model is None:
+            self._model = models.get(self.model_name)
+        return self._model
+
+    async def transcribe(self, pcm: np.ndarray) -> TranscriptionResult:
+        """Queue a float32 16kHz mono utterance and wait for its batch"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((pcm, future))
+        if self._drainer is None:
+            self._drainer = asyncio.create_task(self._drain())
+        return await future
+
+    async def _drain(self):
+        try:
+            while self._pending:
+                if len(self._pending) < self.max_batch:
+                    await asyncio.sleep(self.window)  # let other sessions join this batch
+
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+                batch = [(pcm, future) for pcm, future in batch if not future.cancelled()]
+                if not batch:
+                    continue
+
+                try:
+                    results = await stt_pool.run(self._decode_batch, [pcm for pcm, _ in batch])
+                except Exception as e:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._drainer = None
+
+    def _get_tokenizer(self) -> Tokenizer:
+        if self._tokenizer is None:
+            self._tokenizer = Tokenizer(
+                self.model.hf_tokenizer,
+                self.model.model.is_multilingual,
+                task="transcribe",
+                language=STT_LANGUAGE
+            )
+        return self._tokenizer
+
+    def _decode_batch(self, audios: List[np.ndarray]) -> List[TranscriptionResult]:
+        results: List[Optional[TranscriptionResult]] = [None] * len(audios)
+
+        short = [i for i, audio in enumerate(audios) if len(audio) <= MAX_BATCH_SAMPLES]
+        for i, audio in enumerate(audios):
+            if len(audio) > MAX_BATCH_SAMPLES:
+                results[i] = self._decode_long(audio)
+
+        if short:
+            tokenizer = self._get_tokenizer()
+            features = np.stack([
+                pad_or_trim(self.model.feature_extractor(audios[i])) for i in short
+            ])
+            encoder_output = self.model.encode(features)
+            prompt = self.model.get_prompt(tokenizer, previous_tokens=[], without_timestamps=True)
+            outputs = self.model.model.generate(
+                encoder_output,
+                [prompt] * len(short),
+                beam_size=STT_BEAM_SIZE,
+                max_length=self.model.max_length,
+                return_scores=True,
+                return_no_speech_prob=True
+            )
+            for i, output in zip(short, outputs):
+                tokens = output.sequences_ids[0]
+                results[i] = TranscriptionResult(
+                    text=tokenizer.decode(tokens).strip(),
+                    avg_logprob=output.scores[0] * len(tokens) / (len(tokens) + 1),
+                    no_speech_prob=output.no_speech_prob
+                )
+        return results
+
+    def _decode_long(self, audio: np.ndarray) -> TranscriptionResult:
+        segments, _ = self.model.transcribe(audio, language=STT_LANGUAGE, beam_size=STT_BEAM_SIZE)
+        segments = list(segments)
+        if not segments:
+            return TranscriptionResult(text="")
+        return TranscriptionResult(
+            text=" ".join([segment.text.strip() for segment in segments]),
+            avg_logprob=sum(segment.avg_logprob for segment in segments) / len(segments),
+            no_speech_prob=max(segment.no_speech_prob for segment in segments)
+        )
+
+
+class TieredTranscriptionScheduler:
+    """Sends short utterances ("yes", "next friday") to a small model first and only
+    re-decodes them on the main model when the small one is unsure: low average
+    log-probability, a high no-speech probability or no text at all.
+    """
+
+    def __init__(
+        self,
+        fast: BatchTranscriptionScheduler,
+        accurate: BatchTranscriptionScheduler,
+        max_seconds: float = STT_TIER_MAX_SECONDS,
+        min_logprob: float = STT_TIER_MIN_LOGPROB,
+        max_no_speech: float = STT_TIER_MAX_NO_SPEECH
+    ):
+        self.fast = fast
+        self.accurate = accurate
+        self.max_samples = int(max_seconds * STT_SAMPLE_RATE)
+        self.min_logprob = min_logprob
+        self.max_no_speech = max_no_speech
+
+    def is_confident(self, result: TranscriptionResult) -> bool:
+        return (
+            bool(result.text)
+            and result.avg_logprob >= self.min_logprob
+            and result.no_speech_prob <= self.max_no_speech
+        )
+
+    async def transcribe(self, pcm: np.ndarray) -> TranscriptionResult:
+        if len(pcm) <= self.max_samples:
+            result = await self.fast.transcribe(pcm)
+            if self.is_confident(result):
+                return result
+        return await self.accurate.transcribe(pcm)
+
+
+# Shared by every session so utterances can meet in the same batch
+stt_scheduler = BatchTranscriptionScheduler()
+if STT_TIERING:
+    stt_scheduler = TieredTranscriptionScheduler(
+        fast=BatchTranscriptionScheduler(model_name=FASTER_WHISPER_FAST),
+        accurate=stt_scheduler
+    )
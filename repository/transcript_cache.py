@@ -0,0 +1,81 @@
+""" Transcription results keyed by an audio fingerprint """
+import asyncio
+import threading
+import numpy as np
+import xxhash
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+from schema.sound import STT_RESULT_CACHE_SIZE
+
+class TranscriptCache:
+    """Bounded LRU from xxh3(model config, float32 PCM) to a transcription result.
+
+    Identical audio is decoded at most once: a retry that arrives while the
+    first decode is still running waits for that decode instead of starting
+    its own. Failed decodes are not cached.
+    """
+
+    def __init__(self, max_entries: int = STT_RESULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(config: str, pcm: np.ndarray) -> str:
+        digest = xxhash.xxh3_128(config.encode("utf-8"))
+        digest.update(np.ascontiguousarray(pcm, dtype=np.float32))
+        return digest.hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def put(self, key: str, result):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    async def get_or_transcribe(self, config: str, pcm: np.ndarray, transcribe: Callable[[], Awaitable[Any]]):
+        if self.max_entries <= 0:
+            return await transcribe()
+
+        key = self.key(config, pcm)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(transcribe())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The last caller to give up also cancels the decode
+            if self._waiters.get(key) == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result())
+
+
+# One cache per process, entries of different engines never collide since the config is part of the key
+transcript_cache = TranscriptCache()
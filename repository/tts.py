@@ -0,0 +1,85 @@
+""" Streaming text-to-speech on top of Piper """
+import os
+import asyncio
+import threading
+from typing import AsyncIterator, Optional
+from repository.tts_cache import TTSCache
+from model_registry import models, PIPER
+from utils.cancellation import CancellationToken
+from utils.executors import tts_pool, cache_pool, PoolFull
+
+_DONE = object()
+
+class TTSRepository:
+    """Yields PCM16 audio per sentence while Piper is still synthesizing the rest"""
+
+    def __init__(self, model_path: str, cache: Optional[TTSCache] = None):
+        self.model_id = os.path.basename(model_path)  # identifies the voice in cache keys
+        self.cache = cache
+
+    @property
+    def voice(self):
+        """The Piper voice, loaded by the registry on first use"""
+        return models.get(PIPER)
+
+    @property
+    def sample_rate(self) -> int:
+        return self.voice.config.sample_rate
+
+    async def stream(self, text: str, token: Optional[CancellationToken] = None) -> AsyncIterator[bytes]:
+        """Synthesize on a worker thread and yield each chunk as soon as it is ready.
+
+        Piper emits one chunk per sentence. Leaving the loop early or cancelling
+        `token` stops the worker before its next sentence. Cached text is served
+        without running Piper at all.
+        """
+        key = self.cache.key(self.model_id, text) if self.cache is not None else None
+        if key is not None:
+            try:
+                pcm = await cache_pool.run(self.cache.get, key)
+            except PoolFull:
+                pcm = None  # a saturated cache is a miss, Piper still answers
+            if pcm is not None:
+                yield pcm
+                return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        if token is not None:
+            # The consumer may never resume to run its finally (a cancelled task), the token reaches the thread directly
+            token.on_cancel(stop.set)
+
+        def produce():
+            try:
+                if stop.is_set():
+                    return
+                for chunk in self.voice.synthesize(text):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk.audio_int16_bytes)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+        tts_pool.submit(produce)
+        chunks = []
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                chunks.append(item)
+                yield item
+        finally:
+            stop.set()
+
+        # Only a fully synthesized text is cached
+        if key is not None:
+            try:
+                await cache_pool.run(self.cache.put, key, b"".join(chunks))
+            except PoolFull:
+                pass  # not cached this time
@@ -0,0 +1,116 @@
+""" Content-addressed cache of synthesized speech """
+import os
+import mmap
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+from schema.sound import TTS_CACHE_FOLDER, TTS_CACHE_MEMORY_MB, TTS_CACHE_DISK_MB, TTS_CACHE_MAX_TEXT_CHARS
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class TTSCache:
+    """Raw PCM16 keyed by sha256(voice model, normalized text).
+
+    Lookups hit an in-memory LRU first, then `<key>.pcm` files on disk which
+    are read through mmap and promoted to memory. Both tiers are bounded by
+    bytes; the disk tier evicts the least recently written files.
+    """
+
+    def __init__(
+        self,
+        folder: str = TTS_CACHE_FOLDER,
+        memory_bytes: int = TTS_CACHE_MEMORY_MB * 1024 * 1024,
+        disk_bytes: int = TTS_CACHE_DISK_MB * 1024 * 1024,
+        max_text_chars: int = TTS_CACHE_MAX_TEXT_CHARS
+    ):
+        self.folder = folder
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.max_text_chars = max_text_chars
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+
+        os.makedirs(folder, exist_ok=True)
+        self._disk_used = sum(
+            entry.stat().st_size for entry in os.scandir(folder) if entry.name.endswith(".pcm")
+        )
+
+    def key(self, model_id: str, text: str) -> Optional[str]:
+        """Cache key for a sentence, None if the text is too long to be worth caching"""
+        text = normalize_text(text)
+        if not text or len(text) > self.max_text_chars:
+            return None
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            pcm = self._memory.get(key)
+            if pcm is not None:
+                self._memory.move_to_end(key)
+                return pcm
+
+        try:
+            with open(self._path(key), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pcm = mm[:]
+        except (FileNotFoundError, ValueError):  # ValueError: empty file cannot be mapped
+            return None
+
+        self._remember(key, pcm)
+        return pcm
+
+    def put(self, key: str, pcm: bytes):
+        if not pcm:
+            return
+        self._remember(key, pcm)
+
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pcm)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._disk_used += len(pcm)
+            if self._disk_used > self.disk_bytes:
+                self._evict_disk()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.pcm")
+
+    def _remember(self, key: str, pcm: bytes):
+        if len(pcm) > self.memory_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = pcm
+            self._memory_used += len(pcm)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _evict_disk(self):
+        """Drop the oldest files until the disk tier is back under 90% of its budget"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.folder) if entry.name.endswith(".pcm")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self._disk_used <= self.disk_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._disk_used -= size
+            except FileNotFoundError:
+                pass
@@ -1,35 +1,122 @@
 import os
-import io
+import asyncio
+import hashlib
 import uuid
+from typing import AsyncIterator
 from fastapi import UploadFile
-from schema.sound import UPLOAD_FOLDER
-from sound_model import model as sound_model
+from faster_whisper import decode_audio
+from schema.sound import (
+    UPLOAD_FOLDER, UPLOAD_TEMP_FOLDER, STT_SAMPLE_RATE, UPLOAD_CHUNK_BYTES, UPLOAD_MAX_BYTES, UPLOAD_PIPE_MAX_BYTES,
+    FASTER_WHISPER_MODEL, FASTER_WHISPER_COMPUTE_TYPE, STT_LANGUAGE, STT_BEAM_SIZE,
+    STT_TIERING, STT_TIER_FAST_MODEL, STT_TIER_FAST_COMPUTE_TYPE
+)
+from repository.stt_scheduler import stt_scheduler, TranscriptionResult
+from repository.transcript_cache import transcript_cache
+from utils.audio import PcmBuffer, pcm_to_float32
+from utils.executors import upload_pool, PoolFull
+from utils.upload_pipe import UploadPipe
+
+# Everything that changes the transcript of the same audio
+CACHE_CONFIG = ":".join(map(str, [
+    "faster_whisper", FASTER_WHISPER_MODEL, FASTER_WHISPER_COMPUTE_TYPE, STT_LANGUAGE, STT_BEAM_SIZE,
+    *([STT_TIER_FAST_MODEL, STT_TIER_FAST_COMPUTE_TYPE] if STT_TIERING else [])
+]))
+
+class UploadTooLarge(ValueError):
+    pass
+
 
 class VoiceRepository:
     def __init__(self):
-        pass
+        self.scheduler = stt_scheduler
 
     async def save_voice(self, file: UploadFile, current_user_sub: str):
         """ This repositor will save the voice chat and return a Transcribe text
             Params:
                 file: The uploaded file
                 current_user_sub: Google ID
-                save_file: to save or not
-        """       
-        # Generate unique filename
-        file_ext = os.path.splitext(file.filename)[-1]
-        unique_name = f"{uuid.uuid4().hex}{file_ext}"
-        audio = os.path.join(UPLOAD_FOLDER, current_user_sub, unique_name)
+        """
+        async def chunks():
+            while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+                yield chunk
+
+        return await self.save_voice_stream(chunks(), file.filename, current_user_sub)
+
+    async def save_voice_stream(self, chunks: AsyncIterator[bytes], filename: str, current_user_sub: str):
+        """ Stream an upload to disk chunk by chunk and transcribe it
+            Params:
+                chunks: The upload body as it arrives
+                filename: Original name, only its extension is kept
+                current_user_sub: Google ID
 
+            The file is stored under the sha256 of its content, hashed while streaming.
+            Decoding starts on the first chunk; formats that need seeking (e.g. mp4
+            with its index at the end) are decoded from the saved file instead.
+            Raises UploadTooLarge past UPLOAD_MAX_BYTES.
+        """
+        file_ext = os.path.splitext(filename or "")[-1]
+        tmp_path = os.path.join(UPLOAD_TEMP_FOLDER, f"{uuid.uuid4().hex}{file_ext}")
+        digest = hashlib.sha256()
+        size = 0
+
+        pipe = UploadPipe(UPLOAD_PIPE_MAX_BYTES)
+        try:
+            decoding = upload_pool.submit(decode_audio, pipe, sampling_rate=STT_SAMPLE_RATE)
+            # Once the decoder is done (or has failed) nothing more needs buffering
+            decoding.add_done_callback(lambda _: pipe.abort())
+        except PoolFull:
+            decoding = None
+            pipe.abort()
+
+        try:
+            with open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > UPLOAD_MAX_BYTES:
+                        raise UploadTooLarge(f"Upload exceeds {UPLOAD_MAX_BYTES // (1024 * 1024)} MB")
+                    digest.update(chunk)
+                    f.write(chunk)
+                    pipe.feed(chunk)
+            pipe.finish()
+        except BaseException:
+            pipe.abort()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        unique_name = f"{digest.hexdigest()}{file_ext}"
+        audio = os.path.join(UPLOAD_FOLDER, current_user_sub, unique_name)
         os.makedirs(os.path.dirname(audio), exist_ok=True)
-        # Save file
-        with open(audio, "wb") as f:
-            f.write(await file.read())       
+        os.replace(tmp_path, audio)
+
+        pcm = None
+        if decoding is not None:
+            try:
+                pcm = await asyncio.wrap_future(decoding)
+            except Exception as e:
+                print(f"⚠️ Streaming decode failed ({e}), decoding the saved file")
+        if pcm is None:
+            pcm = await upload_pool.run(decode_audio, audio, sampling_rate=STT_SAMPLE_RATE)
+
+        result = await self.transcribe(pcm)
+
+        return result.text, unique_name
+
+    async def transcribe(self, pcm) -> TranscriptionResult:
+        """Run transcription on the shared batch scheduler, unless this exact audio was transcribed recently"""
+        return await transcript_cache.get_or_transcribe(CACHE_CONFIG, pcm, lambda: self.scheduler.transcribe(pcm))
 
-        # Run transcription
-        segments, _ = sound_model.transcribe(audio)
-        
-        # Concatenate text
-        text = " ".join([segment.text for segment in segments])
+    async def transcribe_pcm(self, pcm: PcmBuffer):
+        """
+        Transcribe an in-memory utterance (PCM16 bytes/memoryview or int16/float32 array, 16kHz mono)
+        as part of the next cross-session batch.
+        """
+        try:
+            result = await self.transcribe(pcm_to_float32(pcm))
+        except Exception as e:
+            return f"Transcription failed: {e}", False
 
-        return text, unique_name
\ No newline at end of file
+        if result.text:
+            return result.text, True
+        else:
+            return "No transcription found", False
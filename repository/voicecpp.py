@@ -1,60 +1,52 @@
-import os, re, uuid, subprocess
-import soundfile as sf  # <-- for direct wav writing
-import shutil
+import os, re, asyncio
+import soundfile as sf  # <-- for direct wav reading
 
-from schema.sound import UPLOAD_FOLDER
+from schema.sound import STT_SAMPLE_RATE, WHISPER_CPP_MODEL
+from repository.whisper_engine import whisper_engine
+from repository.transcript_cache import transcript_cache
+from utils.audio import PcmBuffer, pcm_to_float32
 
 class VoiceRepositoryCpp:
     def __init__(self):
         base_path = r"D:\development\stt\backend"
-        self.model_path = r"D:\development\stt\voice_model\whisper.cpp\models\ggml-base.en.bin"
-        self.exe_path = r"D:\development\stt\voice_model\whisper.cpp\bin\release\whisper-cli.exe"
+        self.base_path = base_path
+        self.engine = whisper_engine
 
-        if not os.path.exists(self.model_path):
-            raise FileNotFoundError(f"Model not found: {self.model_path}")
-        if not os.path.exists(self.exe_path):
-            raise FileNotFoundError(f"Executable not found: {self.exe_path}")
+    async def transcribe_pcm(self, pcm: PcmBuffer):
+        """
+        Transcribe an in-memory utterance (PCM16 bytes/memoryview or int16/float32 array, 16kHz mono).
+        Nothing is written to disk. Cancelling the caller drops the job if it is still queued for a worker.
+        Audio that was already transcribed (e.g. a client retry) is answered from the transcript cache.
+        """
+        try:
+            pcm = pcm_to_float32(pcm)
 
-        self.base_path = base_path
+            async def decode():
+                return await asyncio.wrap_future(self.engine.submit(pcm))
+
+            transcription = await transcript_cache.get_or_transcribe(f"whispercpp:{WHISPER_CPP_MODEL}", pcm, decode)
+        except Exception as e:
+            return f"Transcription failed: {e}", False
+        return self._clean_result(transcription)
 
-    def transcribe_voice(self, file: bytes):
+    def transcribe_voice(self, file: str):
         """
-        Save raw PCM16 (16kHz mono) to wav and run whisper.cpp CLI.
+        Read a PCM16 (16kHz mono) wav and transcribe it on the resident whisper.cpp engine.
         """
-        # unique_name = f"{uuid.uuid4().hex}.wav"
-        # wav_file = os.path.join(UPLOAD_FOLDER, current_user_sub, unique_name)
-        # os.makedirs(os.path.dirname(wav_file), exist_ok=True)
-
-        # if isinstance(file, (bytes, bytearray)):
-        #     # Convert PCM16 buffer -> wav directly
-        #     import numpy as np
-        #     arr = np.frombuffer(file, dtype=np.int16)
-        #     sf.write(wav_file, arr, 16000, subtype="PCM_16")
-        # elif isinstance(file, str) and os.path.exists(file):  # already a path
-        #     shutil.copy(file, wav_file)
-        # else:
-        #     raise ValueError("Unsupported file type for transcribe_voice")
-
-        # Call whisper.cpp directly
-        subp_result = subprocess.run(
-            [
-                self.exe_path,
-                "-m", self.model_path,
-                "-f", os.path.join(self.base_path, file),
-                "--language", "en"
-            ],
-            capture_output=True,
-            text=True,
-            cwd=os.path.dirname(os.path.join(self.base_path, file))
-        )
-
-        if subp_result.returncode == 0:
-            transcription = subp_result.stdout.strip()
-            if transcription:
-                
-                clean_text = re.sub(r'\[.*?\]\s*', '', transcription).strip()
-                return clean_text, True
-            else:
-                return "No transcription found", False
+        audio, sample_rate = sf.read(os.path.join(self.base_path, file), dtype="float32")
+        if sample_rate != STT_SAMPLE_RATE:
+            return f"Transcription failed: expected {STT_SAMPLE_RATE}Hz audio, got {sample_rate}Hz", False
+
+        try:
+            transcription = self.engine.transcribe(pcm_to_float32(audio))
+        except Exception as e:
+            return f"Transcription failed: {e}", False
+        return self._clean_result(transcription)
+
+    def _clean_result(self, transcription: str):
+        transcription = transcription.strip()
+        if transcription:
+            clean_text = re.sub(r'\[.*?\]\s*', '', transcription).strip()
+            return clean_text, True
         else:
-            return f"Transcription failed: {subp_result.stderr}", False
+            return "No transcription found", False
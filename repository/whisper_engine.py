@@ -0,0 +1,85 @@
+""" Resident whisper.cpp transcription engine """
+import threading
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from schema.sound import WHISPER_CPP_MODEL, STT_WORKERS, STT_SAMPLE_RATE
+
+# Model handle of the current worker process, loaded once by the pool initializer
+_worker_model = None
+
+def _init_worker(model_name: str):
+    """Load the whisper.cpp model once when a worker process starts"""
+    global _worker_model
+    from whispercpp import Whisper
+    _worker_model = Whisper.from_pretrained(model_name)
+
+def _transcribe_in_worker(pcm: np.ndarray) -> str:
+    """Runs inside a warm worker process"""
+    return _worker_model.transcribe(pcm)
+
+
+class WhisperCppEngine:
+    """Pool of warm worker processes, each keeping one whisper.cpp model resident.
+
+    PCM buffers (float32, 16kHz mono) are submitted to the pool's job queue and
+    the caller gets a Future back, so no process is spawned and no model is
+    reloaded per utterance.
+    """
+
+    def __init__(self, model_name: str = WHISPER_CPP_MODEL, workers: int = STT_WORKERS):
+        self.model_name = model_name
+        self.workers = workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the pool starts while other threads load models,
+                # and a fork of a multi-threaded process can deadlock its children
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_name,)
+                )
+            return self._pool
+
+    def _reset_pool(self, broken: ProcessPoolExecutor):
+        """Drop a pool whose worker died so the next submit starts a fresh one"""
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, pcm: np.ndarray) -> Future:
+        """Queue a float32 PCM buffer for transcription"""
+        pool = self._get_pool()
+        try:
+            return pool.submit(_transcribe_in_worker, pcm)
+        except BrokenProcessPool:
+            print("⚠️ whisper.cpp worker pool was broken, restarting it")
+            self._reset_pool(pool)
+            return self._get_pool().submit(_transcribe_in_worker, pcm)
+
+    def transcribe(self, pcm: np.ndarray) -> str:
+        """Blocking helper around submit()"""
+        return self.submit(pcm).result()
+
+    def warm(self):
+        """Blocking; start every worker and run one second of silence through each"""
+        silence = np.zeros(STT_SAMPLE_RATE, dtype=np.float32)
+        for future in [self.submit(silence) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Shared engine, worker processes are started on first use
+whisper_engine = WhisperCppEngine()
@@ -1,12 +1,12 @@
 """ Chat routes """
 from datetime import datetime
-from fastapi import APIRouter, Depends, UploadFile
+from fastapi import APIRouter, Depends, Request, UploadFile
 from langgraph.graph.state import RunnableConfig
 from utils.authentication import AuthUser, get_current_user
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Literal
-from repository.voicecpp import VoiceRepositoryCpp
+from repository.voice import VoiceRepository, UploadTooLarge
 from llm.node_main import build_graph
 from llm.states import SharedState
 
@@ -21,17 +21,42 @@ async def transcribe_audio(
     file: UploadFile,
     current_user: AuthUser = Depends(get_current_user)
 ):    
-    print(f"\nTime check\n - calculating : transcribe_audio cpp")
+    print(f"\nTime check\n - calculating : transcribe_audio")
     start_time = datetime.now()
 
-    voice = VoiceRepositoryCpp()
+    voice = VoiceRepository()
 
-    transcribed_text, unique_name = await voice.transcribe_voice(file, current_user.sub)
+    try:
+        transcribed_text, unique_name = await voice.save_voice(file, current_user.sub)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
 
     print(f"\nTranscribe Text: {transcribed_text}") 
     elapsed = (datetime.now() - start_time).total_seconds()
-    print(f"\nTime check\n - after : transcribe_audio cpp - time: {elapsed:.3f}")
+    print(f"\nTime check\n - after : transcribe_audio - time: {elapsed:.3f}")
 
+    return await transcription_response(transcribed_text, unique_name, current_user.sub)
+
+@router.post("/transcribe/stream")
+async def transcribe_audio_stream(
+    request: Request,
+    filename: str = "voice.webm",
+    current_user: AuthUser = Depends(get_current_user)
+):
+    """ Same as /transcribe, but the body is the raw audio file instead of a multipart form,
+        so decoding starts while the upload is still arriving.
+    """
+    voice = VoiceRepository()
+
+    try:
+        transcribed_text, unique_name = await voice.save_voice_stream(request.stream(), filename, current_user.sub)
+    except UploadTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+
+    return await transcription_response(transcribed_text, unique_name, current_user.sub)
+
+async def transcription_response(transcribed_text: str, unique_name: str, current_user_sub: str):
+    """ Run the chat graph on a transcript and build the /transcribe response """
     message_text = ""
     if transcribed_text != "":    
         init_state: SharedState = {
@@ -40,7 +65,7 @@ async def transcribe_audio(
         }
         config: RunnableConfig = {
             "configurable": {
-                "thread_id": current_user.sub,
+                "thread_id": current_user_sub,
                 "checkpoint_ns": "chat"
             }    
         }
@@ -1,37 +1,126 @@
 # routes/stream.py
-import webrtcvad, asyncio
-import numpy as np, soundfile as sf, tempfile, os, traceback
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
+import traceback
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from repository.voicecpp import VoiceRepositoryCpp
-from collections import deque
-from schema.sound import UPLOAD_TEMP_FOLDER, VOICE_MODEL_PATH, VOICE_CONFIG_PATH
-from piper.voice import PiperVoice
-from ai_v2.node_main import build_graph as BuildGraph
+from repository.voice import VoiceRepository
+from repository.streaming_transcriber import StreamingTranscriber
+from repository.tts import TTSRepository
+from repository.tts_cache import TTSCache
+from schema.sound import (
+    STT_ENGINE, STT_SAMPLE_RATE, VOICE_MODEL_PATH,
+    VAD_AGGRESSIVENESS, VAD_FRAME_MS, VAD_START_FRAMES, VAD_HANGOVER_MS, VAD_PRE_ROLL_MS, VAD_MAX_UTTERANCE_MS,
+    VOICE_QUEUE_SIZE, VOICE_QUEUE_POLICY
+)
+from ai_v2.node_main import build_graph as BuildGraph, direct_reply_node
 from utils.ws_auth import validate_access_token
 from ai_v2.states import AgentState
 from langgraph.graph.state import RunnableConfig
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Union
 from utils.cleaner import clean_transcript  
+from utils.vad_segmenter import VadSegmenter, UTTERANCE_START, UTTERANCE_END
+from utils.sentence_splitter import SentenceSplitter, unspoken_text
+from utils.work_queue import BoundedWorkQueue, CLOSED
+from utils.codec import PCM16, PcmCodec, OpusCodec, negotiate_codec
+from utils.cancellation import CancellationToken, CancelGenerationHandler
+from utils.executors import pool_metrics, PoolFull
+from utils.tracing import TurnTrace, Span, recorder
+from model_registry import models
 router = APIRouter(prefix="/stream", tags=["stream"])
-voice = VoiceRepositoryCpp()
-tts = PiperVoice.load(VOICE_MODEL_PATH, VOICE_CONFIG_PATH)
+# faster_whisper batches utterances across sessions, whispercpp keeps its own warm worker pool
+voice = VoiceRepository() if STT_ENGINE == "faster_whisper" else VoiceRepositoryCpp()
+tts = TTSRepository(VOICE_MODEL_PATH, cache=TTSCache())
 graph = BuildGraph()
 
+AudioCodec = Union[PcmCodec, OpusCodec]
+
 # Track active tasks per user
 active_tasks: Dict[str, asyncio.Task] = {}
 
-async def process_speech(voiced_frames: bytes, sample_rate: int, ws: WebSocket, user: dict, current_message_parts: list):
-    """Handle one full utterance (PCM16) from frontend"""
+# Nodes whose LLM tokens are the reply the user hears
+SPOKEN_NODES = {"node_consolidator_manager"}
+# ...and these when they answer the turn on their own (node_registration generates JSON,
+# its reply is spoken once the graph is done)
+DIRECT_SPOKEN_NODES = {"node_neutral"}
+
+async def stream_reply(init_state: AgentState, config: RunnableConfig, sentences: asyncio.Queue, graph_span: Span) -> dict:
+    """Run the graph, pushing complete sentences of the spoken node onto `sentences` as they are generated.
+    Every node run is recorded as a child of `graph_span`.
+    Returns the final graph state; None is queued once the stream is over."""
+    splitter = SentenceSplitter()
+    reply = {}
+    node_spans: Dict[str, Span] = {}
+    spoken_nodes = set(SPOKEN_NODES)
+    try:
+        async for event in graph.astream_events(init_state, config=config, version="v2"):
+            kind = event["event"]
+            node = event["metadata"].get("langgraph_node")
+            if kind == "on_chat_model_stream" and node in spoken_nodes:
+                for sentence in splitter.feed(event["data"]["chunk"].content):
+                    sentences.put_nowait(sentence)
+            elif kind == "on_chain_start" and node and event["name"] == node:
+                node_spans[event["run_id"]] = graph_span.child(node)
+            elif kind == "on_chain_end" and event["run_id"] in node_spans:
+                node_spans.pop(event["run_id"]).finish()
+                if node == "node_classify_intent":
+                    direct = direct_reply_node((event["data"].get("output") or {}).get("intent"))
+                    if direct in DIRECT_SPOKEN_NODES:
+                        spoken_nodes.add(direct)
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                reply = event["data"].get("output") or {}
+
+        rest = splitter.flush()
+        if rest:
+            sentences.put_nowait(rest)
+        return reply
+    finally:
+        graph_span.finish()
+        sentences.put_nowait(None)
+
+def last_message_text(reply: dict) -> str:
+    messages = reply.get("messages") or []
+    if not messages:
+        return ""
+    last_ai_message = messages[-1]
+    if isinstance(last_ai_message, dict):
+        return last_ai_message['content'] if ('content' in last_ai_message) else str(last_ai_message)
+    return last_ai_message.content if hasattr(last_ai_message, 'content') else str(last_ai_message)
+
+async def speak(ws: WebSocket, text: str, codec: AudioCodec, trace: TurnTrace, tts_started: bool = False,
+                token: Optional[CancellationToken] = None):
+    """Send each Piper chunk as its own binary frame (in the negotiated codec) as soon as it is synthesized"""
+    if not tts_started:
+        rate = codec.output_rate(tts.sample_rate)
+        await ws.send_text(f"TTS_START::{rate}" if codec.name == PCM16 else f"TTS_START::{rate}::{codec.name}")
+    with trace.stage("tts", chars=len(text)):
+        async for pcm16 in tts.stream(text, token):
+            await ws.send_bytes(await codec.encode(pcm16, tts.sample_rate))
+            trace.mark("first_audio")
+
+async def process_speech(voiced_frames: bytes, sample_rate: int, ws: WebSocket, user: dict, current_message_parts: list,
+                         transcriber: Optional[StreamingTranscriber] = None,
+                         track: Callable[[asyncio.Task], asyncio.Task] = lambda task: task,
+                         codec: AudioCodec = PcmCodec(),
+                         trace: Optional[TurnTrace] = None):
+    """Transcribe one full utterance (PCM16) from frontend and start the reply turn for it"""
     user_id = user["sub"]
-    tmp_wav = None
+    # The trace starts when the utterance was received, run_turn finishes it once a turn starts
+    trace = trace or TurnTrace(user_id)
+    trace.span("queue", start=trace.root.start).finish()
+    outcome = "no_transcript"
     try:
-        arr = np.frombuffer(voiced_frames, dtype=np.int16)  # PCM16 little-endian
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False, dir=UPLOAD_TEMP_FOLDER) as tf:
-            tmp_wav = tf.name
-            sf.write(tf.name, arr, sample_rate, subtype="PCM_16")
+        if sample_rate != STT_SAMPLE_RATE:
+            print(f"Unsupported sample rate for transcription: {sample_rate}")
+            return
 
         await ws.send_text("BEFORE TRANSCRIPTION")
-        transcribed_text, succeed = await asyncio.to_thread(voice.transcribe_voice, tmp_wav)
+        with trace.stage("stt", partials=transcriber is not None):
+            if transcriber is not None:
+                # Only the audio after the stable prefix of the partials is decoded again
+                transcribed_text, succeed = await transcriber.final(voiced_frames)
+            else:
+                # PCM16 stays in memory, the engine reads it straight from the received buffer
+                transcribed_text, succeed = await voice.transcribe_pcm(memoryview(voiced_frames))
         
         # Ensure it's a string
         if not isinstance(transcribed_text, str):
@@ -45,6 +134,8 @@ async def process_speech(voiced_frames: bytes, sample_rate: int, ws: WebSocket,
             if user_id in active_tasks and not active_tasks[user_id].done():
                 await ws.send_text("CANCEL_AUDIO")
                 active_tasks[user_id].cancel()
+                # Audio still buffered in the encoder belongs to the interrupted reply
+                codec.reset()
 
             # Add new transcribed text to current message parts
             current_message_parts.append(transcribed_text)
@@ -69,94 +160,126 @@ async def process_speech(voiced_frames: bytes, sample_rate: int, ws: WebSocket,
                     "checkpoint_ns": "chat"
                 }    
             }
-                        
-            try:
-                debugging_mode = False
-                if(not debugging_mode):
-                    # Create new graph task
-                    graph_task = asyncio.create_task(graph.ainvoke(init_state, config=config))
-                    
-                    # Wait for graph completion
-                    reply = await graph_task
-                else:
-                    reply = {
-                        "messages": [{
-                            "role": "system",
-                            "content": combined_message
-                        }],
-                        "graph": {
-                            "type": "none",
-                            "data": [],
-                            "note": "Placeholder graph response"
-                        }
-                    }
-                    graph_task = None
-
-                active_tasks[user_id] = graph_task
-
-                # Only clear message parts if we got a successful complete response
-                current_message_parts.clear()
-                print(f"✅ Graph completed successfully, cleared message parts")
-                await ws.send_text("GRAPH_COMPLETE") # Delete soon
-            except asyncio.CancelledError:
-                print(f"🛑 Graph task was cancelled for user {user_id}")
-                # Keep current_message_parts so they can be used in next invocation
-                return
-            except Exception as graph_error:
-                print(f"❌ Graph error: {graph_error}")
-                traceback.print_exc()
-                return
-            finally:
-                # Clean up the task reference                
-                if user_id in active_tasks and active_tasks[user_id] == graph_task:
-                    del active_tasks[user_id]
-            
-            if reply.get("messages") and len(reply["messages"]) > 0:
-                # ------------------------- 
-                # 3️⃣ Generate TTS with Piper ONNX 
-                # -------------------------             
-                messages = reply.get("messages", [])
-                if messages:
-                    last_ai_message = messages[-1]
-                    
-                    if isinstance(last_ai_message, dict):
-                        message_text = last_ai_message['content'] if ('content' in last_ai_message) else str(last_ai_message) 
-                    else:
-                        message_text = last_ai_message.content if hasattr(last_ai_message, 'content') else str(last_ai_message)
-                    
-                    if message_text:
-                        await ws.send_text(f"AI_RESPONSE::{message_text}")
-                        # print("🎤 Starting TTS synthesis task")
-                        # Create cancellable TTS task
-                        # await ws.send_text("BEFORE SYNTHESIZING") # Delete soon for debugging
-
-                        tts_task = asyncio.create_task(
-                            asyncio.to_thread(tts.synthesize, str(message_text))
-                        )
-
-                        # await ws.send_text("AFTER SYNTHESIZING") # Delete soon for debugging
-                        # print("🎤 After TTS synthesis task")
-
-                        try:
-                            tts_chunks = await tts_task
-                            chunk_list = list(tts_chunks)
-
-                            # Concatenate all audio chunks using audio_int16_array (already PCM16)
-                            audio_arrays = [chunk.audio_int16_array for chunk in chunk_list]
-                            pcm16 = np.concatenate(audio_arrays)
-                            # Send the audio data
-                            # await ws.send_text("BEFORE SENDING BYTES") # Delete soon
-                            await ws.send_bytes(pcm16.tobytes())
-                            # await ws.send_text("AFTER SENDING BYTES") # Delete soon
-                            
-                        except asyncio.CancelledError:
-                            print(f"TTS task cancelled for user {user_id}")
-                            return
+
+            # The whole turn (graph + speech) runs on its own task, which is what a barge-in cancels
+            active_tasks[user_id] = track(asyncio.create_task(
+                run_turn(ws, user_id, init_state, config, current_message_parts, codec, trace)
+            ))
+            outcome = None
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
     except Exception as e:
+        outcome = "error"
         print("⚠️ Error during transcription:", e)
     finally:
-        if 'tmp_wav' in locals() and os.path.exists(tmp_wav):
-            os.remove(tmp_wav)
+        if outcome is not None:
+            trace.finish(outcome)
+
+async def run_turn(ws: WebSocket, user_id: str, init_state: AgentState, config: RunnableConfig, current_message_parts: list,
+                   codec: AudioCodec, trace: TurnTrace):
+    """Run the graph for one combined message and speak the reply"""
+    # Cancelling the task only stops the awaits; the token also stops the work running
+    # on threads: LLM calls abort on their next token and Piper before its next sentence
+    token = CancellationToken()
+    config = {**config, "callbacks": [CancelGenerationHandler(token)]}
+
+    # The reply is spoken while the consolidator (or a branch answering on its own) is still generating:
+    # its tokens are split into sentences that feed Piper through this queue
+    sentences: asyncio.Queue = asyncio.Queue()
+    graph_task = asyncio.create_task(stream_reply(init_state, config, sentences, trace.span("graph")))
+    turn_task = asyncio.current_task()
+    spoken = []
+    outcome = "error"
+    try:
+        while True:
+            sentence = await sentences.get()
+            if sentence is None:
+                break
+            await ws.send_text(f"AI_RESPONSE_PARTIAL::{sentence}")
+            await speak(ws, sentence, codec, trace, tts_started=bool(spoken), token=token)
+            spoken.append(sentence)
+
+        reply = await graph_task
+
+        # Only clear message parts if we got a successful complete response
+        current_message_parts.clear()
+        print(f"✅ Graph completed successfully, cleared message parts")
+        await ws.send_text("GRAPH_COMPLETE") # Delete soon
+
+        message_text = last_message_text(reply)
+        if message_text:
+            await ws.send_text(f"AI_RESPONSE::{message_text}")
+            # Speak whatever of the final reply was not streamed: all of it when nothing was
+            # (or a fallback replaced a generation that failed midway), else the rest of it
+            rest = unspoken_text(message_text, spoken)
+            if rest:
+                await speak(ws, rest, codec, trace, tts_started=bool(spoken), token=token)
+        if spoken or message_text:
+            # The tail of the reply is still buffered in the encoder
+            tail = await codec.finish()
+            if tail:
+                await ws.send_bytes(tail)
+            trace.mark("last_byte")
+            await ws.send_text("TTS_END")
+        outcome = "ok"
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        print(f"🛑 Graph task was cancelled for user {user_id}")
+        # Keep current_message_parts so they can be used in next invocation
+    except PoolFull as e:
+        # Piper (or the encoder) is saturated: shed the reply's audio like a shed frame, the
+        # message parts are kept so the next utterance retries them
+        outcome = "shed"
+        print(f"🚦 Reply audio shed for user {user_id}: {e}")
+        codec.reset()
+        await ws.send_text("SHEDDING::tts")
+    except Exception as graph_error:
+        print(f"❌ Graph error: {graph_error}")
+        traceback.print_exc()
+    finally:
+        if outcome == "error":
+            codec.reset()
+        # Nothing of this turn may keep running once it is over
+        token.cancel()
+        graph_task.cancel()
+        trace.finish(outcome)
+        # Clean up the task reference                
+        if user_id in active_tasks and active_tasks[user_id] == turn_task:
+            del active_tasks[user_id]
+
+def drop_utterance(item: tuple, reason: str):
+    """An utterance that will never be handled: shed by a drop policy, or still queued when the socket closed.
+    Its partial decode stops and its turn is still traced."""
+    audio, transcriber, trace = item
+    if transcriber is not None:
+        transcriber.cancel()
+    trace.finish("cancelled" if reason == CLOSED else "shed")
+
+def merge_utterances(older: tuple, newer: tuple) -> tuple:
+    """MERGE shedding policy: transcribe two queued utterances as one.
+    Partial-transcript state does not survive the merge, the result is decoded from scratch.
+    The merged turn keeps the older trace, since that is when the user started waiting."""
+    for transcriber in (older[1], newer[1]):
+        if transcriber is not None:
+            transcriber.cancel()
+    newer[2].finish("merged")
+    return older[0] + newer[0], None, older[2]
+
+@router.get("/pools")
+async def pools():
+    """Queue depth, queue wait and run time of each pipeline stage pool"""
+    return pool_metrics()
+
+@router.get("/latency")
+async def latency():
+    """Latency histograms of completed voice turns, per stage and per node"""
+    return recorder.snapshot()
+
+@router.get("/models")
+async def loaded_models():
+    """Which models this process has loaded, how long they took and the memory they added"""
+    return models.stats()
 
 @router.websocket("/voicein")
 async def voicein(ws: WebSocket):
@@ -175,68 +298,91 @@ async def voicein(ws: WebSocket):
     user = result_validation.to_dict()
     user_id = user["sub"]
 
+    # Audio format in both directions: raw PCM16 (default) or opus packets
+    try:
+        codec = negotiate_codec(ws.query_params.get("codec", PCM16), STT_SAMPLE_RATE)
+    except ValueError as e:
+        print(f"❌ {e}, closing connection")
+        await ws.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
 
-    # VAD setup
-    vad = webrtcvad.Vad(1)  # 0=least aggressive, 3=most aggressive    
-    sample_rate = 16000
-    frame_ms = 30  # 10, 20, or 30 ms only allowed
-    frame_bytes = int(sample_rate * frame_ms / 1000) * 2  # int16=2 bytes
+    # "client": every message is a whole utterance (client-side endpointing)
+    # "server": raw mic audio is streamed and cut into utterances here
+    segmentation = ws.query_params.get("segmentation", "client")
+    segmenter = None
+    if segmentation == "server":
+        segmenter = VadSegmenter(
+            sample_rate=STT_SAMPLE_RATE,
+            frame_ms=VAD_FRAME_MS,
+            aggressiveness=VAD_AGGRESSIVENESS,
+            start_frames=VAD_START_FRAMES,
+            hangover_ms=VAD_HANGOVER_MS,
+            pre_roll_ms=VAD_PRE_ROLL_MS,
+            max_utterance_ms=VAD_MAX_UTTERANCE_MS
+        )
+
+    # Sliding-window partial transcripts while the user is still speaking
+    partials = segmenter is not None and ws.query_params.get("partials") == "1"
+    transcriber: Optional[StreamingTranscriber] = None
+
+    async def send_partial(text: str):
+        await ws.send_text(f"TRANSCRIPT_PARTIAL::{clean_transcript(text)}")
 
-    ring_buffer = deque(maxlen=10)  # short-term buffer to detect speech end
-    speech_buffer = bytearray()
-    in_speech = False
-    silence_threshold = 1
-    voiced_frames = bytearray()
-    
     # Track current message parts for this user session (replaces accumulated_messages)
     current_message_parts = []
 
+    # Utterances wait here for transcription; overflow is shed instead of piling up tasks
+    async def handle_utterance(item: tuple):
+        audio, utterance_transcriber, trace = item
+        await process_speech(audio, STT_SAMPLE_RATE, ws, user, current_message_parts,
+                             utterance_transcriber, work_queue.track, codec, trace)
+
+    async def send_shedding(policy: str):
+        await ws.send_text(f"SHEDDING::{policy}")
+
+    work_queue = BoundedWorkQueue(
+        handle_utterance,
+        maxsize=VOICE_QUEUE_SIZE,
+        policy=VOICE_QUEUE_POLICY,
+        merge=merge_utterances,
+        on_shed=send_shedding,
+        on_drop=drop_utterance
+    )
+
     try:
         while True:
-            pcm_bytes = await ws.receive_bytes()   # receive full utterance
-            
-            # directly launch transcription for this utterance
-            asyncio.create_task(
-                process_speech(pcm_bytes, 16000, ws, user, current_message_parts)
-            )
-            # msg = await ws.receive_bytes()  # PCM16 (16kHz, mono)
-            # speech_buffer.extend(msg)
-
-            # # process in fixed-size frames for VAD
-            # while len(speech_buffer) >= frame_bytes:
-            #     frame = speech_buffer[:frame_bytes]
-            #     speech_buffer = speech_buffer[frame_bytes:]
-
-            #     is_speech = vad.is_speech(frame, sample_rate) # detect if the frame has speech or silence
-            #     ring_buffer.append((frame, is_speech)) # append a tuple [(F1,true), (F2,false), (F3,true), (F4, true), (F5,false), (F6, true), (F7, false), (F8, true), (F9, false),..]
-                               
-
-            #     # start of speech
-            #     if is_speech and not in_speech:
-            #         in_speech = True
-            #         voiced_frames = bytearray()
-            #         for f, _ in ring_buffer:
-            #             voiced_frames.extend(f)
-            #         # Do NOT clear ring_buffer here; let it accumulate for silence detection
-
-            #     if in_speech:
-            #         voiced_frames.extend(frame)
-                
-            #     # if silence detected for long enough → end of speech
-            #     if in_speech and sum(1 for _, s in ring_buffer if not s) > silence_threshold:                    
-            #         # Launch async transcription without blocking main loop
-            #         print("🛫 Detected end of speech, launching transcription task")
-            #         task = asyncio.create_task(
-            #             process_speech(voiced_frames, sample_rate, ws, user, current_message_parts)
-            #         )
-                    
-            #         in_speech = False
-            #         ring_buffer.clear()  # Only clear here, after silence detected
-            #         voiced_frames = bytearray()
-            #     else:
-            #         msg = f"...continuing speech: in_speech={in_speech}, ring_buffer_silences={sum(1 for _, s in ring_buffer if not s)}"
-            #         print(msg.ljust(80), end='\r', flush=True)
-                    
+            payload = await ws.receive_bytes()
+            if segmenter is not None and not payload:
+                # An empty message means the client stopped its mic: the utterance in progress ends here
+                events = segmenter.flush()
+            else:
+                try:
+                    pcm_bytes = await codec.decode(payload)   # PCM16 (16kHz, mono)
+                except PoolFull:
+                    # The codec pool is saturated: shed this frame instead of dropping the connection
+                    await ws.send_text("SHEDDING::codec")
+                    continue
+
+                if segmenter is None:
+                    # every message is one utterance
+                    work_queue.put((pcm_bytes, None, TurnTrace(user_id, segmentation=segmentation)))
+                    continue
+                events = segmenter.feed(pcm_bytes)
+
+            for event in events:
+                if event.kind == UTTERANCE_START:
+                    await ws.send_text("SPEECH_START")
+                    if partials:
+                        transcriber = StreamingTranscriber(voice)
+                elif event.kind == UTTERANCE_END:
+                    await ws.send_text("SPEECH_END")
+                    print("🛫 Detected end of speech, queueing transcription")
+                    work_queue.put((event.audio, transcriber, TurnTrace(user_id, segmentation=segmentation)))
+                    transcriber = None
+
+            if transcriber is not None and segmenter.in_speech:
+                transcriber.update(segmenter.current_audio(), segmenter.last_pause, send_partial)
+
     except WebSocketDisconnect:
         print("❌ Client disconnected")
         # Cancel any active tasks for this user
@@ -248,6 +394,9 @@ async def voicein(ws: WebSocket):
         traceback.print_exc()
     finally:
         print("🔒 WebSocket closed")
+        if transcriber is not None:
+            transcriber.cancel()
+        await work_queue.close()
         # Clean up any remaining tasks
         if user_id in active_tasks:
             active_tasks[user_id].cancel()
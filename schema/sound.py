@@ -8,6 +8,100 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 UPLOAD_TEMP_FOLDER = "temp"
 os.makedirs(UPLOAD_TEMP_FOLDER, exist_ok=True)
 
+# Uploads are streamed to disk (and to the decoder) in chunks
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(64 * 1024)))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_MB", "25")) * 1024 * 1024
+UPLOAD_PIPE_MAX_BYTES = int(os.getenv("UPLOAD_PIPE_MAX_MB", "4")) * 1024 * 1024  # backlog allowed for a slow decoder
+
 
 VOICE_MODEL_PATH = r"D:\development\stt\voice_model\piper-stt\models\en\en_US-amy-medium.onnx"
 VOICE_CONFIG_PATH = r"D:\development\stt\voice_model\piper-stt\models\en\en_US-amy-medium.onnx.json"
+
+# Speech-to-text (resident whisper.cpp engine)
+STT_SAMPLE_RATE = 16000
+WHISPER_CPP_MODEL = os.getenv("WHISPER_CPP_MODEL", "base.en")
+STT_WORKERS = int(os.getenv("STT_WORKERS", "2"))
+
+# Models held by model_registry, loaded on first use unless preloaded at startup
+FASTER_WHISPER_MODEL = os.getenv("FASTER_WHISPER_MODEL", "medium")  # tiny, base, small, medium, large-v3, ...
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "float32")  # float32, int8_float32 or int8
+FASTER_WHISPER_CPU_THREADS = int(os.getenv("FASTER_WHISPER_CPU_THREADS", "0"))  # 0 lets CTranslate2 decide
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+PRELOAD_MODELS = [name for name in os.getenv("PRELOAD_MODELS", "piper,embedder").split(",") if name]  # loaded at startup even with WARMUP=0
+WARMUP = os.getenv("WARMUP", "1") == "1"  # run a dummy inference through every model (and Ollama) at startup
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))  # first retry of a failed warm-up, doubled after each failure
+WARMUP_RETRY_MAX_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "60"))
+
+# Server-side endpointing for /stream/voicein?segmentation=server (an empty message ends the utterance in progress)
+VAD_AGGRESSIVENESS = int(os.getenv("VAD_AGGRESSIVENESS", "1"))  # 0=least aggressive, 3=most aggressive
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "30"))  # 10, 20, or 30 ms only allowed
+VAD_START_FRAMES = int(os.getenv("VAD_START_FRAMES", "3"))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "300"))
+VAD_PRE_ROLL_MS = int(os.getenv("VAD_PRE_ROLL_MS", "300"))
+VAD_MAX_UTTERANCE_MS = int(os.getenv("VAD_MAX_UTTERANCE_MS", "30000"))
+
+# Partial transcription for /stream/voicein?segmentation=server&partials=1
+PARTIAL_STEP_MS = int(os.getenv("PARTIAL_STEP_MS", "700"))  # new audio needed before re-decoding the tail
+PARTIAL_MAX_WINDOW_MS = int(os.getenv("PARTIAL_MAX_WINDOW_MS", "8000"))  # tail length before it is committed
+PARTIAL_MIN_TAIL_MS = int(os.getenv("PARTIAL_MIN_TAIL_MS", "500"))
+
+# Per-connection backpressure on /stream/voicein
+VOICE_QUEUE_SIZE = int(os.getenv("VOICE_QUEUE_SIZE", "3"))  # utterances waiting for transcription
+VOICE_QUEUE_POLICY = os.getenv("VOICE_QUEUE_POLICY", "merge")  # drop_oldest, drop_newest or merge
+
+# faster-whisper batched scheduler (shared by every session and /api/transcribe)
+STT_ENGINE = os.getenv("STT_ENGINE", "whispercpp")  # engine behind /stream/voicein: whispercpp or faster_whisper
+STT_LANGUAGE = "en"
+STT_BEAM_SIZE = int(os.getenv("STT_BEAM_SIZE", "5"))
+STT_BATCH_WINDOW_MS = int(os.getenv("STT_BATCH_WINDOW_MS", "30"))
+STT_BATCH_MAX = int(os.getenv("STT_BATCH_MAX", "16"))
+
+# Tiered faster-whisper: short utterances try a small model first and escalate when it is unsure
+STT_TIERING = os.getenv("STT_TIERING", "0") == "1"
+STT_TIER_FAST_MODEL = os.getenv("STT_TIER_FAST_MODEL", "base.en")
+STT_TIER_FAST_COMPUTE_TYPE = os.getenv("STT_TIER_FAST_COMPUTE_TYPE", "int8_float32")
+STT_TIER_MAX_SECONDS = float(os.getenv("STT_TIER_MAX_SECONDS", "3"))  # longer utterances go straight to the main model
+STT_TIER_MIN_LOGPROB = float(os.getenv("STT_TIER_MIN_LOGPROB", "-0.7"))
+STT_TIER_MAX_NO_SPEECH = float(os.getenv("STT_TIER_MAX_NO_SPEECH", "0.5"))
+
+# Transcripts of recently decoded audio, so resent utterances are not decoded again (0 disables)
+STT_RESULT_CACHE_SIZE = int(os.getenv("STT_RESULT_CACHE_SIZE", "512"))
+
+# Text-to-speech cache (raw PCM16 per sentence)
+TTS_CACHE_FOLDER = os.getenv("TTS_CACHE_FOLDER", "tts_cache")
+TTS_CACHE_MEMORY_MB = int(os.getenv("TTS_CACHE_MEMORY_MB", "64"))
+TTS_CACHE_DISK_MB = int(os.getenv("TTS_CACHE_DISK_MB", "512"))
+TTS_CACHE_MAX_TEXT_CHARS = int(os.getenv("TTS_CACHE_MAX_TEXT_CHARS", "300"))
+
+# Audio codec negotiated with /stream/voicein?codec=pcm16|opus
+CODEC_WORKERS = int(os.getenv("CODEC_WORKERS", "2"))
+OPUS_BITRATE = int(os.getenv("OPUS_BITRATE", "24000"))
+OPUS_OUTPUT_RATE = 24000  # opus supports 8/12/16/24/48 kHz
+OPUS_FRAME_MS = 20
+CODEC_POOL_QUEUE = int(os.getenv("CODEC_POOL_QUEUE", "64"))
+
+# Executor pools per pipeline stage (threads, and jobs allowed to wait for one)
+STT_POOL_WORKERS = int(os.getenv("STT_POOL_WORKERS", "1"))  # faster-whisper already uses several cores per batch
+STT_POOL_QUEUE = int(os.getenv("STT_POOL_QUEUE", "8"))
+TTS_POOL_WORKERS = int(os.getenv("TTS_POOL_WORKERS", "2"))
+TTS_POOL_QUEUE = int(os.getenv("TTS_POOL_QUEUE", "16"))
+EMBEDDING_POOL_WORKERS = int(os.getenv("EMBEDDING_POOL_WORKERS", "1"))
+EMBEDDING_POOL_QUEUE = int(os.getenv("EMBEDDING_POOL_QUEUE", "16"))
+UPLOAD_POOL_WORKERS = int(os.getenv("UPLOAD_POOL_WORKERS", "2"))  # decoders waiting on uploads still in flight
+UPLOAD_POOL_QUEUE = int(os.getenv("UPLOAD_POOL_QUEUE", "8"))
+CACHE_POOL_WORKERS = int(os.getenv("CACHE_POOL_WORKERS", "2"))  # TTS cache disk reads and writes
+CACHE_POOL_QUEUE = int(os.getenv("CACHE_POOL_QUEUE", "32"))
+
+# Per-turn latency traces (JSON lines, empty to keep only the in-process histograms)
+TRACE_FILE = os.getenv("TRACE_FILE", "traces/voice_turns.jsonl")
+TRACE_FILE_MAX_MB = int(os.getenv("TRACE_FILE_MAX_MB", "50"))  # then rotated to <TRACE_FILE>.1, 0 to never rotate
+
+# Embedding nearest-centroid intent classifier tried before the LLM one (ambiguous messages still go to the LLM)
+# Off until python -m benchmarks.intent has validated the thresholds below against the deployed embedder
+INTENT_FAST_PATH = os.getenv("INTENT_FAST_PATH", "0") == "1"
+INTENT_FAST_PATH_MIN_SCORE = float(os.getenv("INTENT_FAST_PATH_MIN_SCORE", "0.55"))  # cosine to the closest centroid
+INTENT_FAST_PATH_MIN_MARGIN = float(os.getenv("INTENT_FAST_PATH_MIN_MARGIN", "0.1"))  # over the second closest
+INTENT_FAST_PATH_MAX_WORDS = int(os.getenv("INTENT_FAST_PATH_MAX_WORDS", "30"))
+
+# How node_availability answers: "direct" runs one structured event lookup, "react" lets the LLM agent call the search tool
+AVAILABILITY_MODE = os.getenv("AVAILABILITY_MODE", "direct")
@@ -1,10 +1,9 @@
 """ Sound model """
 
-from faster_whisper import WhisperModel
+from model_registry import models, FASTER_WHISPER
 
-from whispercpp import Whisper
-
-# Load model once at startup (CPU mode for now)
-model = WhisperModel("medium", device="cpu", compute_type="float32")  
-
-modelcpp = Whisper.from_pretrained("small.en")
+# Models are loaded on first access through the registry, not at import
+def __getattr__(name):
+    if name == "model":
+        return models.get(FASTER_WHISPER)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,60 @@
+from datetime import datetime
+from ai_v2.event_query import EventQuery, parse_event_query
+
+NOW = datetime(2025, 3, 14, 15, 30)
+
+def test_today_is_the_whole_day():
+    assert parse_event_query("Is there anything today?", NOW) == EventQuery(
+        start=datetime(2025, 3, 14), end=datetime(2025, 3, 15)
+    )
+
+def test_tomorrow_is_the_next_day():
+    assert parse_event_query("Any tournament tomorrow?", NOW) == EventQuery(
+        start=datetime(2025, 3, 15), end=datetime(2025, 3, 16), keyword="tournament"
+    )
+
+def test_upcoming_keywords_start_now():
+    assert parse_event_query("What's coming up?", NOW) == EventQuery(start=NOW)
+
+def test_no_date_rule_defaults_to_upcoming():
+    assert parse_event_query("What events do you have?", NOW) == EventQuery(start=NOW)
+
+def test_weekend_is_saturday_and_sunday():
+    assert parse_event_query("Any games this weekend?", NOW) == EventQuery(
+        start=datetime(2025, 3, 15), end=datetime(2025, 3, 17)
+    )
+    assert parse_event_query("Anything next weekend?", NOW) == EventQuery(
+        start=datetime(2025, 3, 22), end=datetime(2025, 3, 24)
+    )
+
+def test_weekend_on_a_sunday_keeps_only_the_rest_of_it():
+    assert parse_event_query("Any games this weekend?", datetime(2025, 3, 16, 10)) == EventQuery(
+        start=datetime(2025, 3, 16), end=datetime(2025, 3, 17)
+    )
+
+def test_weeks_start_on_monday():
+    assert parse_event_query("What's on this week?", NOW) == EventQuery(
+        start=datetime(2025, 3, 14), end=datetime(2025, 3, 17)
+    )
+    assert parse_event_query("Any workshop next week?", NOW) == EventQuery(
+        start=datetime(2025, 3, 17), end=datetime(2025, 3, 24), keyword="workshop"
+    )
+
+def test_weekday_is_the_nearest_one():
+    assert parse_event_query("Is there a game on Tuesday?", NOW) == EventQuery(
+        start=datetime(2025, 3, 18), end=datetime(2025, 3, 19)
+    )
+    assert parse_event_query("Anything Friday?", NOW) == EventQuery(
+        start=datetime(2025, 3, 14), end=datetime(2025, 3, 15)
+    )
+
+def test_next_weekday_is_after_today():
+    assert parse_event_query("Put me down for next Friday's tournament", NOW) == EventQuery(
+        start=datetime(2025, 3, 21), end=datetime(2025, 3, 22), keyword="tournament"
+    )
+    assert parse_event_query("What about next Sunday?", NOW) == EventQuery(
+        start=datetime(2025, 3, 16), end=datetime(2025, 3, 17)
+    )
+
+def test_first_matching_keyword_only():
+    assert parse_event_query("A casual beginner workshop", NOW).keyword == "beginner"
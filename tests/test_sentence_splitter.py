@@ -0,0 +1,43 @@
+from utils.sentence_splitter import SentenceSplitter, unspoken_text
+
+def feed_all(splitter: SentenceSplitter, tokens: list) -> list:
+    sentences = []
+    for token in tokens:
+        sentences.extend(splitter.feed(token))
+    return sentences
+
+def test_sentences_are_handed_out_as_soon_as_they_end():
+    splitter = SentenceSplitter()
+    assert splitter.feed("There is a tournament on ") == []
+    assert splitter.feed("Saturday. It starts") == ["There is a tournament on Saturday."]
+    assert splitter.flush() == "It starts"
+    assert splitter.flush() is None
+
+def test_abbreviations_are_not_split_off():
+    splitter = SentenceSplitter()
+    tokens = ["Mr. ", "Reyes hosts ", "the finals. ", "Dr. Cruz ", "joins too! ", "See you"]
+    assert feed_all(splitter, tokens) == ["Mr. Reyes hosts the finals.", "Dr. Cruz joins too!"]
+    assert splitter.flush() == "See you"
+
+def test_short_sentences_merge_into_the_next():
+    splitter = SentenceSplitter(min_chars=12)
+    assert feed_all(splitter, ["Hi! ", "Yes. ", "The event is full. "]) == ["Hi! Yes. The event is full."]
+
+def test_quotes_and_newlines_end_a_sentence():
+    splitter = SentenceSplitter()
+    assert splitter.feed('He said "count me in." Then\nwe signed him up\n') == [
+        'He said "count me in."', "Then\nwe signed him up"
+    ]
+
+def test_unspoken_text_is_the_rest_of_the_reply():
+    spoken = ["There is a tournament on Saturday."]
+    final = "There is a tournament  on Saturday.\nIt starts at 7 PM."
+    assert unspoken_text(final, spoken) == "It starts at 7 PM."
+
+def test_unspoken_text_is_empty_when_everything_was_heard():
+    assert unspoken_text("Hello there. Bye now.", ["Hello there.", "Bye now."]) == ""
+
+def test_unspoken_text_is_the_whole_reply_when_it_diverged():
+    # A fallback replaced a generation that failed midway
+    assert unspoken_text("Sorry, something went wrong.", ["There is a tour"]) == "Sorry, something went wrong."
+    assert unspoken_text("Nothing was streamed.", []) == "Nothing was streamed."
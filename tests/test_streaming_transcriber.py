@@ -0,0 +1,93 @@
+import asyncio
+from repository.streaming_transcriber import StreamingTranscriber
+
+class FakeVoice:
+    """Transcribes a buffer into the number of bytes it holds and records every decode"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.decoded = []
+
+    async def transcribe_pcm(self, pcm: memoryview):
+        self.decoded.append(bytes(pcm))
+        await asyncio.sleep(self.delay)
+        return f"<{len(pcm)}>", True
+
+def transcriber(voice: FakeVoice) -> StreamingTranscriber:
+    # 1000 Hz keeps the numbers small: 1 ms of audio is 2 bytes
+    return StreamingTranscriber(voice, sample_rate=1000, step_ms=100, max_window_ms=500, min_tail_ms=100)
+
+def test_partial_waits_for_a_step_of_new_audio():
+    async def scenario():
+        voice, partials = FakeVoice(), []
+        stt = transcriber(voice)
+
+        async def on_partial(text):
+            partials.append(text)
+
+        stt.update(memoryview(bytes(100)), 0, on_partial)
+        assert stt._task is None
+        stt.update(memoryview(bytes(300)), 0, on_partial)
+        await stt._task
+        return partials
+
+    assert asyncio.run(scenario()) == ["<300>"]
+
+def test_long_utterance_commits_a_stable_prefix_up_to_the_last_pause():
+    async def scenario():
+        voice, partials = FakeVoice(), []
+        stt = transcriber(voice)
+
+        async def on_partial(text):
+            partials.append(text)
+
+        audio = bytes(range(256)) * 5  # 1280 bytes, past the 1000 byte window
+        stt.update(memoryview(audio), 800, on_partial)
+        await stt._task
+        text, succeed = await stt.final(audio + bytes(220))
+        return voice.decoded, partials, stt, text, succeed, audio
+
+    decoded, partials, stt, text, succeed, audio = asyncio.run(scenario())
+    assert decoded[0] == audio[:800]
+    assert decoded[1] == audio[800:]
+    assert partials == ["<800> <480>"]
+    assert stt.committed_bytes == 800
+    # The final decode never covers the committed prefix again
+    assert decoded[2] == audio[800:] + bytes(220)
+    assert (text, succeed) == ("<800> <700>", True)
+
+def test_final_cancels_the_partial_in_flight():
+    async def scenario():
+        voice, partials = FakeVoice(delay=10), []
+        stt = transcriber(voice)
+
+        async def on_partial(text):
+            partials.append(text)
+
+        stt.update(memoryview(bytes(300)), 0, on_partial)
+        await asyncio.sleep(0)
+        partial_task = stt._task
+        voice.delay = 0
+        result = await stt.final(bytes(400))
+        return partial_task, partials, result
+
+    partial_task, partials, result = asyncio.run(scenario())
+    assert partial_task.cancelled()
+    assert partials == []
+    assert result == ("<400>", True)
+
+def test_cancel_stops_the_partial_in_flight():
+    async def scenario():
+        voice = FakeVoice(delay=10)
+        stt = transcriber(voice)
+
+        async def on_partial(text):
+            raise AssertionError("a cancelled partial must not be sent")
+
+        stt.update(memoryview(bytes(300)), 0, on_partial)
+        await asyncio.sleep(0)
+        stt.cancel()
+        await asyncio.gather(stt._task, return_exceptions=True)
+        return stt._task
+
+    assert asyncio.run(scenario()).cancelled()
@@ -0,0 +1,87 @@
+import asyncio
+import numpy as np
+import pytest
+
+pytest.importorskip("xxhash")
+from repository.transcript_cache import TranscriptCache
+
+PCM = np.linspace(-1, 1, 1600, dtype=np.float32)
+
+def test_identical_audio_is_decoded_once():
+    async def scenario():
+        cache, calls = TranscriptCache(max_entries=4), []
+
+        async def transcribe():
+            calls.append(1)
+            return "hello", True
+
+        first = await cache.get_or_transcribe("base", PCM, transcribe)
+        second = await cache.get_or_transcribe("base", PCM.copy(), transcribe)
+        return first, second, calls
+
+    first, second, calls = asyncio.run(scenario())
+    assert first == second == ("hello", True)
+    assert len(calls) == 1
+
+def test_concurrent_requests_share_the_decode_in_flight():
+    async def scenario():
+        cache, calls = TranscriptCache(max_entries=4), []
+
+        async def transcribe():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "hello", True
+
+        results = await asyncio.gather(*(cache.get_or_transcribe("base", PCM, transcribe) for _ in range(3)))
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == [("hello", True)] * 3
+    assert len(calls) == 1
+
+def test_model_config_is_part_of_the_key():
+    assert TranscriptCache.key("base", PCM) != TranscriptCache.key("small", PCM)
+    assert TranscriptCache.key("base", PCM) == TranscriptCache.key("base", PCM.astype(np.float64))
+
+def test_failed_decodes_are_not_cached():
+    async def scenario():
+        cache, calls = TranscriptCache(max_entries=4), []
+
+        async def transcribe():
+            calls.append(1)
+            raise RuntimeError("decoder crashed")
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await cache.get_or_transcribe("base", PCM, transcribe)
+        return calls
+
+    assert len(asyncio.run(scenario())) == 2
+
+def test_last_waiter_giving_up_cancels_the_decode():
+    async def scenario():
+        cache = TranscriptCache(max_entries=4)
+        started = asyncio.Event()
+        decode = []
+
+        async def transcribe():
+            decode.append(asyncio.current_task())
+            started.set()
+            await asyncio.sleep(10)
+
+        waiter = asyncio.create_task(cache.get_or_transcribe("base", PCM, transcribe))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.gather(waiter, decode[0], return_exceptions=True)
+        return decode[0]
+
+    assert asyncio.run(scenario()).cancelled()
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TranscriptCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from utils.work_queue import BoundedWorkQueue, DROP_OLDEST, DROP_NEWEST, MERGE, CLOSED
+
+async def blocked_queue(policy: str, **kwargs):
+    """A queue whose worker is stuck on item 0, so later items wait"""
+    handled, dropped, shed = [], [], []
+    release = asyncio.Event()
+
+    async def handler(item):
+        handled.append(item)
+        await release.wait()
+
+    async def on_shed(policy):
+        shed.append(policy)
+
+    queue = BoundedWorkQueue(handler, maxsize=2, policy=policy, on_shed=on_shed,
+                             on_drop=lambda item, reason: dropped.append((item, reason)), **kwargs)
+    queue.put(0)
+    await asyncio.sleep(0)
+    return queue, release, handled, dropped, shed
+
+def test_items_are_handled_in_order():
+    async def scenario():
+        handled = []
+
+        async def handler(item):
+            handled.append(item)
+
+        queue = BoundedWorkQueue(handler, maxsize=3)
+        for item in range(3):
+            assert queue.put(item)
+        await asyncio.sleep(0.01)
+        await queue.close()
+        return handled
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
+
+def test_drop_oldest_discards_the_longest_waiting_item():
+    async def scenario():
+        queue, release, handled, dropped, shed = await blocked_queue(DROP_OLDEST)
+        assert [queue.put(item) for item in (1, 2, 3)] == [True, True, False]
+        release.set()
+        await asyncio.sleep(0.01)
+        await queue.close()
+        return handled, dropped, shed
+
+    handled, dropped, shed = asyncio.run(scenario())
+    assert handled == [0, 2, 3]
+    assert dropped == [(1, DROP_OLDEST)]
+    assert shed == [DROP_OLDEST]
+
+def test_drop_newest_rejects_the_incoming_item():
+    async def scenario():
+        queue, release, handled, dropped, shed = await blocked_queue(DROP_NEWEST)
+        assert [queue.put(item) for item in (1, 2, 3)] == [True, True, False]
+        release.set()
+        await asyncio.sleep(0.01)
+        await queue.close()
+        return handled, dropped, shed
+
+    handled, dropped, shed = asyncio.run(scenario())
+    assert handled == [0, 1, 2]
+    assert dropped == [(3, DROP_NEWEST)]
+    assert shed == [DROP_NEWEST]
+
+def test_merge_folds_the_incoming_item_into_the_newest():
+    async def scenario():
+        queue, release, handled, dropped, shed = await blocked_queue(MERGE, merge=lambda older, newer: older + newer)
+        assert [queue.put(item) for item in (1, 2, 3, 4)] == [True, True, False, False]
+        release.set()
+        await asyncio.sleep(0.01)
+        await queue.close()
+        return handled, dropped, shed
+
+    handled, dropped, shed = asyncio.run(scenario())
+    assert handled == [0, 1, 9]
+    assert dropped == []
+    assert shed == [MERGE, MERGE]
+
+def test_merge_needs_a_merge_function():
+    with pytest.raises(ValueError):
+        BoundedWorkQueue(lambda item: None, policy=MERGE)
+
+def test_close_drops_waiting_items_and_cancels_the_worker():
+    async def scenario():
+        queue, release, handled, dropped, shed = await blocked_queue(DROP_OLDEST)
+        queue.put(1)
+        tasks = list(queue.tasks)
+        await queue.close()
+        return handled, dropped, tasks
+
+    handled, dropped, tasks = asyncio.run(scenario())
+    assert handled == [0]
+    assert dropped == [(1, CLOSED)]
+    assert all(task.cancelled() for task in tasks)
+
+def test_a_failing_item_does_not_stop_the_worker():
+    async def scenario():
+        handled = []
+
+        async def handler(item):
+            if item == "bad":
+                raise RuntimeError("boom")
+            handled.append(item)
+
+        queue = BoundedWorkQueue(handler)
+        queue.put("bad")
+        queue.put("good")
+        await asyncio.sleep(0.01)
+        await queue.close()
+        return handled
+
+    assert asyncio.run(scenario()) == ["good"]
@@ -0,0 +1,25 @@
+""" In-memory PCM helpers """
+import numpy as np
+from typing import Union
+
+PcmBuffer = Union[bytes, bytearray, memoryview, np.ndarray]
+
+def pcm_to_float32(pcm: PcmBuffer) -> np.ndarray:
+    """Convert a PCM16 byte buffer or an int16/float32 array to float32 in [-1, 1].
+
+    Bytes-like input is viewed in place with np.frombuffer, so the only copy is
+    the int16 -> float32 conversion itself.
+    """
+    if isinstance(pcm, np.ndarray):
+        arr = pcm
+    else:
+        arr = np.frombuffer(pcm, dtype=np.int16)  # PCM16 little-endian
+
+    if arr.dtype == np.int16:
+        arr = arr.astype(np.float32) / 32768.0
+    elif arr.dtype != np.float32:
+        arr = arr.astype(np.float32)
+
+    if arr.ndim > 1:
+        arr = arr.mean(axis=1, dtype=np.float32)
+    return arr
@@ -0,0 +1,68 @@
+""" Cancellation tokens shared by every stage of a voice turn """
+import threading
+from typing import Any, Callable, List
+from langchain_core.callbacks import BaseCallbackHandler
+
+class TurnCancelled(Exception):
+    """Raised inside worker threads once their turn has been cancelled"""
+
+
+class CancellationToken:
+    """Thread-safe flag checked by work that asyncio cannot cancel:
+    LLM generations running in graph threads and Piper synthesis loops."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], Any]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print("⚠️ Cancellation callback failed:", e)
+
+    def on_cancel(self, callback: Callable[[], Any]):
+        """Run `callback` when the token is cancelled (right away if it already is)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TurnCancelled("Turn was cancelled")
+
+
+class CancelGenerationHandler(BaseCallbackHandler):
+    """Aborts LLM calls of a cancelled turn.
+
+    Raising from on_llm_new_token breaks out of the streaming loop, which
+    closes the HTTP response and makes Ollama stop generating. Calls that
+    have not started yet are refused before the request is sent.
+    """
+    raise_error = True
+    run_inline = True
+
+    def __init__(self, token: CancellationToken):
+        self.token = token
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.token.raise_if_cancelled()
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.token.raise_if_cancelled()
+
+    def on_llm_new_token(self, token: str, **kwargs):
+        self.token.raise_if_cancelled()
@@ -0,0 +1,159 @@
+""" Audio codecs negotiated per /stream/voicein connection """
+import struct
+import threading
+import numpy as np
+from schema.sound import OPUS_BITRATE, OPUS_OUTPUT_RATE, OPUS_FRAME_MS
+from utils.executors import codec_pool
+
+PCM16 = "pcm16"
+OPUS = "opus"
+
+_LENGTH = struct.Struct(">H")
+
+def pack_packets(packets) -> bytes:
+    """One WebSocket message = a sequence of [uint16 big-endian length][packet]"""
+    return b"".join(_LENGTH.pack(len(packet)) + packet for packet in packets)
+
+def unpack_packets(payload: bytes):
+    view = memoryview(payload)
+    pos = 0
+    while pos + _LENGTH.size <= len(view):
+        (length,) = _LENGTH.unpack_from(view, pos)
+        pos += _LENGTH.size
+        yield bytes(view[pos:pos + length])
+        pos += length
+
+
+class PcmCodec:
+    """Raw PCM16 both ways (the original protocol)"""
+    name = PCM16
+
+    def output_rate(self, source_rate: int) -> int:
+        return source_rate
+
+    async def decode(self, payload: bytes) -> bytes:
+        return payload
+
+    async def encode(self, pcm16: bytes, sample_rate: int) -> bytes:
+        return pcm16
+
+    async def finish(self) -> bytes:
+        return b""
+
+    def reset(self):
+        pass
+
+
+class OpusCodec:
+    """Opus packets both ways, framed with pack_packets().
+
+    Inbound audio is decoded to PCM16 at `input_rate`, outbound PCM16 is
+    resampled to OPUS_OUTPUT_RATE and encoded. Each direction keeps one codec
+    context for the whole connection, guarded by a lock. The encoder is flushed
+    by finish() at the end of every reply and discarded by reset() on barge-in.
+    """
+    name = OPUS
+
+    def __init__(self, input_rate: int, bitrate: int = OPUS_BITRATE, output_rate: int = OPUS_OUTPUT_RATE):
+        import av  # PyAV, only needed when a client negotiates opus
+        self._av = av
+        self.input_rate = input_rate
+        self.bitrate = bitrate
+        self.rate = output_rate
+        self.frame_samples = int(output_rate * OPUS_FRAME_MS / 1000)
+
+        self._decoder = av.CodecContext.create("libopus", "r")
+        self._decoder.sample_rate = input_rate
+        self._decoder.layout = "mono"
+        self._decode_resampler = av.AudioResampler(format="s16", layout="mono", rate=input_rate)
+        self._decode_lock = threading.Lock()
+
+        self._encoder = None
+        self._encode_resampler = None
+        self._encode_source_rate = None
+        self._encode_generation = 0  # bumped by reset(), encodes submitted before it are dropped
+        self._encode_lock = threading.Lock()
+
+    def output_rate(self, source_rate: int) -> int:
+        return self.rate
+
+    async def decode(self, payload: bytes) -> bytes:
+        return await codec_pool.run(self._decode, payload)
+
+    async def encode(self, pcm16: bytes, sample_rate: int) -> bytes:
+        return await codec_pool.run(self._encode, pcm16, sample_rate, self._encode_generation)
+
+    async def finish(self) -> bytes:
+        """Packets still buffered in the resampler and the encoder, to send before TTS_END"""
+        return await codec_pool.run(self._finish, self._encode_generation)
+
+    def reset(self):
+        """Throw away the encoder state (barge-in): nothing buffered so far is ever sent"""
+        with self._encode_lock:
+            self._encode_generation += 1
+            self._encoder = None
+            self._encode_resampler = None
+
+    def _decode(self, payload: bytes) -> bytes:
+        pcm = []
+        with self._decode_lock:
+            for packet in unpack_packets(payload):
+                for frame in self._decoder.decode(self._av.Packet(packet)):
+                    for resampled in self._decode_resampler.resample(frame):
+                        pcm.append(resampled.to_ndarray().tobytes())
+        return b"".join(pcm)
+
+    def _open_encoder(self, source_rate: int):
+        av = self._av
+        self._encoder = av.CodecContext.create("libopus", "w")
+        self._encoder.sample_rate = self.rate
+        self._encoder.layout = "mono"
+        self._encoder.format = "s16"
+        self._encoder.bit_rate = self.bitrate
+        self._encode_resampler = av.AudioResampler(
+            format="s16", layout="mono", rate=self.rate, frame_size=self.frame_samples
+        )
+        self._encode_source_rate = source_rate
+
+    def _encode(self, pcm16: bytes, sample_rate: int, generation: int) -> bytes:
+        av = self._av
+        samples = np.frombuffer(pcm16, dtype=np.int16)
+        packets = []
+        with self._encode_lock:
+            if generation != self._encode_generation:
+                return b""
+            if self._encoder is None or self._encode_source_rate != sample_rate:
+                self._open_encoder(sample_rate)
+
+            frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+            frame.sample_rate = sample_rate
+            # The resampler cuts exact encoder frames and carries the remainder into the next chunk
+            for resampled in self._encode_resampler.resample(frame):
+                for packet in self._encoder.encode(resampled):
+                    packets.append(bytes(packet))
+        return pack_packets(packets)
+
+    def _finish(self, generation: int) -> bytes:
+        packets = []
+        with self._encode_lock:
+            if generation != self._encode_generation or self._encoder is None:
+                return b""
+            # libopus accepts a short last frame, so the resampler remainder is encoded as is
+            for resampled in self._encode_resampler.resample(None):
+                for packet in self._encoder.encode(resampled):
+                    packets.append(bytes(packet))
+            for packet in self._encoder.encode(None):
+                packets.append(bytes(packet))
+            # A flushed encoder takes no more frames, the next reply opens a new one
+            self._encoder = None
+            self._encode_resampler = None
+        return pack_packets(packets)
+
+
+def negotiate_codec(name: str, input_rate: int):
+    """Codec for the `codec` query parameter, ValueError if unsupported"""
+    if name == PCM16:
+        return PcmCodec()
+    if name == OPUS:
+        return OpusCodec(input_rate)
+    raise ValueError(f"Unsupported codec: {name}")
@@ -0,0 +1,139 @@
+""" Named executor pools, one per voice pipeline stage """
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict
+from schema.sound import (
+    STT_POOL_WORKERS, STT_POOL_QUEUE, TTS_POOL_WORKERS, TTS_POOL_QUEUE,
+    EMBEDDING_POOL_WORKERS, EMBEDDING_POOL_QUEUE, CODEC_WORKERS, CODEC_POOL_QUEUE,
+    UPLOAD_POOL_WORKERS, UPLOAD_POOL_QUEUE, CACHE_POOL_WORKERS, CACHE_POOL_QUEUE
+)
+
+class PoolFull(RuntimeError):
+    """Raised when a pool already has `max_queue` jobs waiting for a thread"""
+
+
+class _Timing:
+    """Count, mean and tail of the most recent samples (seconds)"""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self._recent)
+        p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p95_ms": round(p95 * 1000, 2),
+            "max_ms": round(self.max * 1000, 2)
+        }
+
+
+class StagePool:
+    """Thread pool dedicated to one stage, so a burst in one stage cannot starve another.
+
+    At most `max_queue` jobs may wait for a thread; beyond that submit() raises
+    PoolFull instead of letting latency grow without bound. Every job records
+    how long it waited for a thread and how long it ran.
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._wait = _Timing()
+        self._run = _Timing()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise PoolFull(f"{self.name} pool has {self._queued} jobs waiting")
+            self._queued += 1
+        enqueued = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._wait.add(started - enqueued)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._run.add(time.perf_counter() - started)
+
+        future = self._executor.submit(job)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future):
+        # Only a job that never started can be cancelled, it still counts as queued
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+                self._cancelled += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Await `fn` on this pool; cancelling the caller drops the job if it has not started"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def call(self, fn, *args, **kwargs):
+        """Blocking variant for synchronous code running off the event loop (e.g. LangChain tools,
+        which agents run on a thread); async code, graph nodes included, must await run()"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "rejected": self._rejected,
+                "cancelled": self._cancelled,
+                "queue_wait": self._wait.snapshot(),
+                "run_time": self._run.snapshot()
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+stt_pool = StagePool("stt", STT_POOL_WORKERS, STT_POOL_QUEUE)
+tts_pool = StagePool("tts", TTS_POOL_WORKERS, TTS_POOL_QUEUE)
+embedding_pool = StagePool("embedding", EMBEDDING_POOL_WORKERS, EMBEDDING_POOL_QUEUE)
+codec_pool = StagePool("codec", CODEC_WORKERS, CODEC_POOL_QUEUE)
+upload_pool = StagePool("upload", UPLOAD_POOL_WORKERS, UPLOAD_POOL_QUEUE)
+cache_pool = StagePool("cache", CACHE_POOL_WORKERS, CACHE_POOL_QUEUE)
+
+POOLS: Dict[str, StagePool] = {
+    pool.name: pool for pool in (stt_pool, tts_pool, embedding_pool, codec_pool, upload_pool, cache_pool)
+}
+
+def pool_metrics() -> dict:
+    return {name: pool.metrics() for name, pool in POOLS.items()}
+
+def shutdown_pools():
+    for pool in POOLS.values():
+        pool.shutdown()
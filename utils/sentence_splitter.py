@@ -0,0 +1,43 @@
+""" Incremental sentence splitting for token streams """
+import re
+from typing import List, Optional
+
+# End of sentence punctuation (optionally closed by quotes/brackets) followed by whitespace, or a newline
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\n+")
+
+class SentenceSplitter:
+    """Collect streamed tokens and hand out complete sentences as soon as they end.
+
+    Pieces shorter than `min_chars` ("Mr.", "Hi!") are merged into the next
+    sentence so TTS does not get tiny fragments.
+    """
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, token: str) -> List[str]:
+        self._buffer += token
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream is over"""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+def unspoken_text(message_text: str, spoken: list) -> str:
+    """The part of the final reply the user has not heard yet"""
+    final = " ".join(message_text.split())
+    heard = " ".join(" ".join(spoken).split())
+    if heard and final.startswith(heard):
+        return final[len(heard):].strip()
+    return final
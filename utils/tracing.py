@@ -0,0 +1,218 @@
+""" Per-turn latency traces for the voice pipeline """
+import os
+import json
+import time
+import uuid
+import queue
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from schema.sound import TRACE_FILE, TRACE_FILE_MAX_MB
+
+TURN_OK = "ok"
+
+class Span:
+    """One timed stage of a turn; children are nested stages"""
+
+    def __init__(self, name: str, start: Optional[float] = None, **attrs):
+        self.name = name
+        self.start = time.perf_counter() if start is None else start
+        self.end: Optional[float] = None
+        self.attrs = attrs
+        self.children: List["Span"] = []
+
+    def child(self, name: str, **attrs) -> "Span":
+        span = Span(name, **attrs)
+        self.children.append(span)
+        return span
+
+    def finish(self, **attrs):
+        if self.end is None:
+            self.end = time.perf_counter()
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            "name": self.name,
+            "start_ms": round((self.start - origin) * 1000, 2),
+            "duration_ms": None if self.end is None else round(self.duration * 1000, 2),
+            **self.attrs,
+            "children": [child.to_dict(origin) for child in self.children]
+        }
+
+
+class TurnTrace:
+    """Span tree of one voice turn, from the utterance being received to the last audio byte sent.
+
+    Marks are points in time (first audio chunk, last byte) measured from the
+    start of the turn; only their first occurrence is kept.
+    """
+
+    def __init__(self, user_id: str, **attrs):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.timestamp = time.time()
+        self.root = Span("turn", **attrs)
+        self.marks: Dict[str, float] = {}
+        self.status: Optional[str] = None
+
+    def span(self, name: str, parent: Optional[Span] = None, **attrs) -> Span:
+        return (parent or self.root).child(name, **attrs)
+
+    @contextmanager
+    def stage(self, name: str, parent: Optional[Span] = None, **attrs):
+        span = self.span(name, parent, **attrs)
+        try:
+            yield span
+        finally:
+            span.finish()
+
+    def mark(self, name: str):
+        self.marks.setdefault(name, time.perf_counter() - self.root.start)
+
+    def finish(self, status: str = TURN_OK):
+        """Close the turn and hand it to the recorder (only the first call counts)"""
+        if self.status is not None:
+            return
+        self.status = status
+        self.root.finish()
+        recorder.record(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "turn_id": self.id,
+            "user_id": self.user_id,
+            "timestamp": self.timestamp,
+            "status": self.status,
+            "marks_ms": {name: round(at * 1000, 2) for name, at in self.marks.items()},
+            "spans": self.root.to_dict(self.root.start)
+        }
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)"""
+    BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.sum_ms += ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th quantile (None past the last bucket)"""
+        target = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else None
+        return None
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 2) if self.total else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, self.BUCKETS_MS), "inf"], self.counts))
+        }
+
+
+class TraceRecorder:
+    """Feeds finished turns into per-stage histograms and appends them to a JSON lines file.
+
+    Histograms only count completed turns, so cancelled or failed turns do not
+    skew the latencies; the file keeps every turn. The file is written by a
+    background thread, record() itself never does I/O on the caller's thread.
+    Past `max_bytes` the file is rotated to `<path>.1`, replacing the previous one.
+    """
+
+    def __init__(self, path: str = TRACE_FILE, max_pending: int = 1024,
+                 max_bytes: int = TRACE_FILE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._pending: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=max_pending)
+        self._writer: Optional[threading.Thread] = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def record(self, trace: TurnTrace):
+        with self._lock:
+            if trace.status == TURN_OK:
+                self._observe_span(trace.root)
+                for name, at in trace.marks.items():
+                    self._histogram(name).observe(at * 1000)
+
+            if self.path:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+                    self._writer.start()
+                try:
+                    self._pending.put_nowait(trace.to_dict())
+                except queue.Full:
+                    print("⚠️ Trace writer is behind, dropping turn trace")
+
+    def _write_loop(self):
+        while True:
+            entries = [self._pending.get()]
+            # Everything queued meanwhile goes out in the same write
+            while True:
+                try:
+                    entries.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            done = None in entries
+            lines = "".join(json.dumps(entry) + "\n" for entry in entries if entry is not None)
+            if lines:
+                try:
+                    self._rotate(len(lines))
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(lines)
+                except OSError as e:
+                    print("⚠️ Could not write turn traces:", e)
+            if done:
+                return
+
+    def _rotate(self, incoming: int):
+        if self.max_bytes <= 0 or not os.path.exists(self.path):
+            return
+        if os.path.getsize(self.path) + incoming > self.max_bytes:
+            os.replace(self.path, self.path + ".1")
+
+    def close(self, timeout: float = 5.0):
+        """Flush the traces still waiting to be written"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._pending.put(None)
+            writer.join(timeout)
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        if name not in self._histograms:
+            self._histograms[name] = LatencyHistogram()
+        return self._histograms[name]
+
+    def _observe_span(self, span: Span):
+        if span.duration is not None:
+            self._histogram(span.name).observe(span.duration * 1000)
+        for child in span.children:
+            self._observe_span(child)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in self._histograms.items()}
+
+
+recorder = TraceRecorder()
@@ -0,0 +1,74 @@
+""" Hands an upload to a decoder thread while it is still arriving """
+import io
+import threading
+from collections import deque
+
+class UploadAborted(IOError):
+    """The upload failed or the pipe gave up, the decoder must stop reading"""
+
+
+class UploadPipe(io.RawIOBase):
+    """Non-seekable file object fed by the request coroutine and read by a decoder thread.
+
+    Reads block until more of the upload has arrived. At most `max_buffered`
+    bytes are held for a reader that falls behind; past that the pipe aborts
+    and the caller decodes the saved file instead.
+    """
+
+    def __init__(self, max_buffered: int):
+        super().__init__()
+        self.max_buffered = max_buffered
+        self._chunks = deque()
+        self._buffered = 0
+        self._finished = False
+        self._aborted = False
+        self._cond = threading.Condition()
+
+    def feed(self, chunk: bytes):
+        with self._cond:
+            if self._aborted:
+                return
+            if self._buffered + len(chunk) > self.max_buffered:
+                self._abort_locked()
+                return
+            self._chunks.append(memoryview(chunk))
+            self._buffered += len(chunk)
+            self._cond.notify()
+
+    def finish(self):
+        """The whole upload has been fed"""
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def abort(self):
+        with self._cond:
+            self._abort_locked()
+
+    def _abort_locked(self):
+        self._aborted = True
+        self._chunks.clear()
+        self._buffered = 0
+        self._cond.notify_all()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        with self._cond:
+            while not self._chunks and not self._finished and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                raise UploadAborted("Upload pipe was aborted")
+            if not self._chunks:
+                return 0  # end of upload
+
+            chunk = self._chunks[0]
+            size = min(len(buffer), len(chunk))
+            buffer[:size] = chunk[:size]
+            if size == len(chunk):
+                self._chunks.popleft()
+            else:
+                self._chunks[0] = chunk[size:]
+            self._buffered -= size
+            return size
@@ -0,0 +1,138 @@
+""" Streaming server-side endpointing with webrtcvad """
+import webrtcvad
+from dataclasses import dataclass
+from typing import List, Optional
+
+UTTERANCE_START = "start"
+UTTERANCE_END = "end"
+
+@dataclass
+class SegmentEvent:
+    kind: str                       # UTTERANCE_START or UTTERANCE_END
+    audio: Optional[bytes] = None   # whole utterance PCM16, only set on UTTERANCE_END
+
+
+class VadSegmenter:
+    """Cut a continuous PCM16 mono stream into utterances.
+
+    Incoming chunks of any size are written into a fixed ring of frame slots;
+    the VAD reads each slot through a precomputed memoryview, so there is no
+    per-frame slicing or allocation. Voiced frames (plus the pre-roll still in
+    the ring) are copied once into a preallocated utterance buffer.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        aggressiveness: int = 1,
+        start_frames: int = 3,
+        hangover_ms: int = 300,
+        pre_roll_ms: int = 300,
+        max_utterance_ms: int = 30000
+    ):
+        if frame_ms not in (10, 20, 30):
+            raise ValueError("frame_ms must be 10, 20 or 30")
+
+        self.sample_rate = sample_rate
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * 2  # int16=2 bytes
+        self.start_frames = start_frames
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.vad = webrtcvad.Vad(aggressiveness)
+
+        # Ring of frame slots, also serves as the pre-roll history
+        self.ring_frames = max(start_frames, pre_roll_ms // frame_ms)
+        self._ring = bytearray(self.ring_frames * self.frame_bytes)
+        ring_view = memoryview(self._ring)
+        self._slots = [
+            ring_view[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+            for i in range(self.ring_frames)
+        ]
+        self._head = 0          # slot currently being filled
+        self._fill = 0          # bytes already in the current slot
+        self._frames_seen = 0   # frames in the ring since the last utterance ended
+
+        max_frames = max(1, max_utterance_ms // frame_ms) + self.ring_frames
+        self._utterance = bytearray(max_frames * self.frame_bytes)
+        self._utterance_view = memoryview(self._utterance)
+        self._utterance_len = 0
+
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silence_run = 0
+        self.last_pause = 0     # utterance offset right after the latest unvoiced frame
+
+    def feed(self, chunk: bytes) -> List[SegmentEvent]:
+        """Consume an arbitrary-size PCM16 chunk and return the events it triggered"""
+        events = []
+        data = memoryview(chunk).cast("B")
+        pos = 0
+        while pos < len(data):
+            take = min(self.frame_bytes - self._fill, len(data) - pos)
+            self._slots[self._head][self._fill:self._fill + take] = data[pos:pos + take]
+            self._fill += take
+            pos += take
+
+            if self._fill == self.frame_bytes:
+                event = self._process_frame(self._head)
+                self._fill = 0
+                self._head = (self._head + 1) % self.ring_frames
+                if event is not None:
+                    events.append(event)
+        return events
+
+    def flush(self) -> List[SegmentEvent]:
+        """Close the utterance in progress, e.g. when the client disconnects"""
+        if self.in_speech:
+            return [self._finish()]
+        return []
+
+    def current_audio(self) -> memoryview:
+        """Read-only view of the utterance in progress, valid until the next feed()"""
+        return self._utterance_view[:self._utterance_len].toreadonly()
+
+    def _process_frame(self, idx: int) -> Optional[SegmentEvent]:
+        is_speech = self.vad.is_speech(self._slots[idx], self.sample_rate)
+        self._frames_seen = min(self._frames_seen + 1, self.ring_frames)
+
+        if not self.in_speech:
+            self._voiced_run = self._voiced_run + 1 if is_speech else 0
+            if self._voiced_run < self.start_frames:
+                return None
+
+            # Start of speech: the utterance begins with the pre-roll still in the ring
+            self.in_speech = True
+            self._silence_run = 0
+            self._utterance_len = 0
+            self.last_pause = 0
+            for back in range(self._frames_seen - 1, -1, -1):
+                self._append((idx - back) % self.ring_frames)
+            return SegmentEvent(UTTERANCE_START)
+
+        self._append(idx)
+        if is_speech:
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+            self.last_pause = self._utterance_len
+
+        # End of speech after the hangover, or when the utterance buffer is full
+        if (self._silence_run >= self.hangover_frames
+                or self._utterance_len + self.frame_bytes > len(self._utterance)):
+            return self._finish()
+        return None
+
+    def _append(self, idx: int):
+        end = self._utterance_len + self.frame_bytes
+        self._utterance_view[self._utterance_len:end] = self._slots[idx]
+        self._utterance_len = end
+
+    def _finish(self) -> SegmentEvent:
+        audio = bytes(self._utterance_view[:self._utterance_len])
+        self.in_speech = False
+        self._voiced_run = 0
+        self._silence_run = 0
+        self._frames_seen = 0
+        self._utterance_len = 0
+        self.last_pause = 0
+        return SegmentEvent(UTTERANCE_END, audio)
@@ -0,0 +1,86 @@
+""" Startup warm-up of every model on the voice path """
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict
+from schema.sound import PRELOAD_MODELS, STT_ENGINE, STT_TIERING, INTENT_FAST_PATH, WARMUP_RETRY_SECONDS, WARMUP_RETRY_MAX_SECONDS
+from model_registry import models, FASTER_WHISPER, FASTER_WHISPER_FAST
+from repository.whisper_engine import whisper_engine
+from llm_model import base_llm
+from ai_v2.intent_fast_path import intent_classifier
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+class Readiness:
+    """Warm-up status per component; the app is ready once warm-up started and every component is"""
+
+    def __init__(self):
+        self.started = False
+        self.components: Dict[str, dict] = {}
+
+    def set(self, name: str, status: str, **details):
+        self.components[name] = {"status": status, **details}
+
+    @property
+    def ready(self) -> bool:
+        return self.started and all(c["status"] == READY for c in self.components.values())
+
+
+readiness = Readiness()
+
+async def _warm_ollama():
+    # Only a token is generated; every other option (num_ctx above all) must match real
+    # requests, otherwise Ollama reloads the model on the first of them
+    await base_llm.model_copy(update={"num_predict": 1}).ainvoke("Hi")
+
+def warmup_tasks(warm: bool = True) -> Dict[str, Callable[[], Awaitable]]:
+    """PRELOAD_MODELS are always loaded; with `warm` every model on the voice path
+    (plus the whisper.cpp workers and Ollama) also runs one dummy inference"""
+    if not warm:
+        return {name: (lambda name=name: asyncio.to_thread(models.preload, [name])) for name in PRELOAD_MODELS}
+
+    names = set(PRELOAD_MODELS)
+    if STT_ENGINE == "faster_whisper":
+        names.add(FASTER_WHISPER)
+        if STT_TIERING:
+            names.add(FASTER_WHISPER_FAST)
+
+    tasks = {name: (lambda name=name: asyncio.to_thread(models.warm, name)) for name in sorted(names)}
+    if STT_ENGINE == "whispercpp":
+        tasks["whispercpp"] = lambda: asyncio.to_thread(whisper_engine.warm)
+    if INTENT_FAST_PATH:
+        tasks["intent_centroids"] = lambda: asyncio.to_thread(lambda: intent_classifier.centroids)
+    tasks["ollama"] = _warm_ollama
+    return tasks
+
+async def _warm(name: str, warm: Callable[[], Awaitable]):
+    """Retry with exponential backoff until it succeeds (e.g. Ollama not up yet when the backend boots),
+    so a dependency that comes back later still turns /ready green"""
+    attempt = 0
+    while True:
+        attempt += 1
+        started = time.perf_counter()
+        try:
+            await warm()
+            break
+        except Exception as e:
+            retry_in = min(WARMUP_RETRY_SECONDS * 2 ** (attempt - 1), WARMUP_RETRY_MAX_SECONDS)
+            print(f"❌ Warm-up of {name} failed (attempt {attempt}), retrying in {retry_in:.0f}s: {e}")
+            readiness.set(name, FAILED, error=str(e), attempts=attempt, retry_in_seconds=retry_in)
+            await asyncio.sleep(retry_in)
+    elapsed = time.perf_counter() - started
+    print(f"🔥 {name} warmed up in {elapsed:.2f}s")
+    readiness.set(name, READY, seconds=round(elapsed, 2), attempts=attempt)
+
+def start_warm_up(warm: bool = True) -> asyncio.Task:
+    """Load (and with `warm`, warm) every component in parallel in the background, each blocking step on its own thread.
+    Components are marked pending right away, so readiness never reports a warm-up that has not run."""
+    tasks = warmup_tasks(warm)
+    for name in tasks:
+        readiness.set(name, PENDING)
+    readiness.started = True
+    return asyncio.create_task(_warm_all(tasks))
+
+async def _warm_all(tasks: Dict[str, Callable[[], Awaitable]]):
+    await asyncio.gather(*(_warm(name, warm) for name, warm in tasks.items()))
@@ -0,0 +1,106 @@
+""" Bounded per-connection work queue with load shedding """
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional, Set
+
+DROP_OLDEST = "drop_oldest"   # discard the oldest waiting item to make room
+DROP_NEWEST = "drop_newest"   # reject the incoming item
+MERGE = "merge"               # fold the incoming item into the newest waiting one
+CLOSED = "closed"             # on_drop reason of the items still waiting when the queue is closed
+
+class BoundedWorkQueue:
+    """Serializes one connection's work on a single worker task.
+
+    At most `maxsize` items wait behind the one being handled; overflow is
+    shed according to `policy` and reported through `on_shed`; every item
+    that is never handled (dropped by the policy, or still waiting at close())
+    is passed to `on_drop` with the reason. Every task the
+    queue (or its users, through track()) starts is strongly referenced until
+    it finishes, and close() cancels them all.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        maxsize: int = 3,
+        policy: str = DROP_OLDEST,
+        merge: Optional[Callable[[Any, Any], Any]] = None,
+        on_shed: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_drop: Optional[Callable[[Any, str], None]] = None
+    ):
+        if policy not in (DROP_OLDEST, DROP_NEWEST, MERGE):
+            raise ValueError(f"Unknown shedding policy: {policy}")
+        if policy == MERGE and merge is None:
+            raise ValueError("The merge policy needs a merge function")
+
+        self.handler = handler
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.merge = merge
+        self.on_shed = on_shed
+        self.on_drop = on_drop
+        self.tasks: Set[asyncio.Task] = set()
+
+        self._items = deque()
+        self._ready = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """Keep a strong reference to `task` until it is done"""
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def put(self, item) -> bool:
+        """Queue an item; returns False if it was dropped or merged"""
+        accepted = True
+        if len(self._items) >= self.maxsize:
+            accepted = False
+            if self.policy == DROP_NEWEST:
+                self._dropped(item, self.policy)
+                item = None
+            elif self.policy == MERGE:
+                self._items[-1] = self.merge(self._items[-1], item)
+                item = None
+            else:
+                self._dropped(self._items.popleft(), self.policy)
+
+            print(f"⚠️ Work queue full, shedding input ({self.policy})")
+            if self.on_shed is not None:
+                self.track(asyncio.create_task(self.on_shed(self.policy)))
+
+        if item is not None:
+            self._items.append(item)
+            self._ready.set()
+
+        if self._worker is None:
+            self._worker = self.track(asyncio.create_task(self._run()))
+        return accepted
+
+    def _dropped(self, item, reason: str):
+        if self.on_drop is not None:
+            try:
+                self.on_drop(item, reason)
+            except Exception as e:
+                print("⚠️ on_drop failed:", e)
+
+    async def _run(self):
+        while True:
+            while not self._items:
+                self._ready.clear()
+                await self._ready.wait()
+
+            item = self._items.popleft()
+            try:
+                await self.handler(item)
+            except Exception as e:
+                print("⚠️ Work item failed:", e)
+
+    async def close(self):
+        """Drop waiting items and cancel every tracked task"""
+        while self._items:
+            self._dropped(self._items.popleft(), CLOSED)
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)